@@ -81,11 +81,20 @@ export async function GET(request) {
     const job_type = searchParams.getAll('job_type') || [];
     const experience = searchParams.getAll('experience') || [];
     const skills = searchParams.getAll('skills') || [];
+    const skills_match = searchParams.get('skills_match') || '';
     
     let queryString = `?page=${page}&per_page=${per_page}`;
     if (keyword) queryString += `&keyword=${encodeURIComponent(keyword)}`;
     if (location) queryString += `&location=${encodeURIComponent(location)}`;
     if (category) queryString += `&category=${encodeURIComponent(category)}`;
+    if (skills_match) queryString += `&skills_match=${encodeURIComponent(skills_match)}`;
+    if (searchParams.get('facets') === 'true') queryString += '&facets=true';
+    
+    // Cursor (keyset) pagination: an empty cursor requests the first page
+    if (searchParams.has('cursor')) {
+      queryString += `&cursor=${encodeURIComponent(searchParams.get('cursor'))}`;
+      if (searchParams.get('include_total') === 'true') queryString += '&include_total=true';
+    }
     
     job_type.forEach(type => {
       queryString += `&job_type=${encodeURIComponent(type)}`;
@@ -3,6 +3,10 @@
 import Link from 'next/link'
 import React, { useState, useEffect } from 'react'
 
+// Skills with a checkbox in the filters, sent as facet_skills so each one gets
+// a count even when it isn't among the most common skills
+const FILTER_SKILLS = ['javascript', 'python', 'react', 'nodejs', 'sql']
+
 function page() {
     // State for jobs data
     const [jobs, setJobs] = useState([])
@@ -11,6 +15,7 @@ function page() {
     const [totalJobs, setTotalJobs] = useState(0)
     const [totalPages, setTotalPages] = useState(0)
     const [currentPage, setCurrentPage] = useState(1)
+    const [facets, setFacets] = useState(null)
     
     // State for filters
     const [searchParams, setSearchParams] = useState({
@@ -33,6 +38,7 @@ function page() {
             // Build query parameters
             const params = new URLSearchParams()
             params.append('page', page)
+            params.append('facets', 'true')
             
             if (searchParams.keyword) params.append('keyword', searchParams.keyword)
             if (searchParams.location) params.append('location', searchParams.location)
@@ -49,6 +55,10 @@ function page() {
                 params.append('skills', skill)
             })
             
+            FILTER_SKILLS.forEach(skill => {
+                params.append('facet_skills', skill)
+            })
+            
             const response = await fetch(`/api/jobs?${params.toString()}`)
             
             if (!response.ok) {
@@ -60,6 +70,7 @@ function page() {
             setTotalJobs(data.total)
             setTotalPages(data.pages)
             setCurrentPage(data.current_page)
+            setFacets(data.facets || null)
             setLoading(false)
         } catch (err) {
             setError(err.message)
@@ -103,6 +114,12 @@ function page() {
         fetchJobs(1) // Reset to first page when applying filters
     }
 
+    // Number of matching jobs for a filter option, from the facets in the response
+    const facetCount = (facet, value) => {
+        const entry = facets?.[facet]?.find(item => item.value === value)
+        return entry ? ` (${entry.count})` : ''
+    }
+
     // Handle pagination
     const handlePageChange = (newPage) => {
         if (newPage > 0 && newPage <= totalPages) {
@@ -175,7 +192,7 @@ function page() {
                                             onChange={() => handleFilterChange('job_type', 'Full-time')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="full-time" className="ml-2 text-sm text-gray-700">Full-time</label>
+                                        <label htmlFor="full-time" className="ml-2 text-sm text-gray-700">Full-time{facetCount('job_type', 'Full-time')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -186,7 +203,7 @@ function page() {
                                             onChange={() => handleFilterChange('job_type', 'Part-time')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="part-time" className="ml-2 text-sm text-gray-700">Part-time</label>
+                                        <label htmlFor="part-time" className="ml-2 text-sm text-gray-700">Part-time{facetCount('job_type', 'Part-time')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -197,7 +214,7 @@ function page() {
                                             onChange={() => handleFilterChange('job_type', 'Contract')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="contract" className="ml-2 text-sm text-gray-700">Contract</label>
+                                        <label htmlFor="contract" className="ml-2 text-sm text-gray-700">Contract{facetCount('job_type', 'Contract')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -208,7 +225,7 @@ function page() {
                                             onChange={() => handleFilterChange('job_type', 'Freelance')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="freelance" className="ml-2 text-sm text-gray-700">Freelance</label>
+                                        <label htmlFor="freelance" className="ml-2 text-sm text-gray-700">Freelance{facetCount('job_type', 'Freelance')}</label>
                                     </div>
                                 </div>
                             </div>
@@ -225,7 +242,7 @@ function page() {
                                             onChange={() => handleFilterChange('experience', 'Entry')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="entry" className="ml-2 text-sm text-gray-700">Entry Level</label>
+                                        <label htmlFor="entry" className="ml-2 text-sm text-gray-700">Entry Level{facetCount('experience_level', 'Entry')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -236,7 +253,7 @@ function page() {
                                             onChange={() => handleFilterChange('experience', 'Mid')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="mid" className="ml-2 text-sm text-gray-700">Mid Level</label>
+                                        <label htmlFor="mid" className="ml-2 text-sm text-gray-700">Mid Level{facetCount('experience_level', 'Mid')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -247,7 +264,7 @@ function page() {
                                             onChange={() => handleFilterChange('experience', 'Senior')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="senior" className="ml-2 text-sm text-gray-700">Senior Level</label>
+                                        <label htmlFor="senior" className="ml-2 text-sm text-gray-700">Senior Level{facetCount('experience_level', 'Senior')}</label>
                                     </div>
                                 </div>
                             </div>
@@ -264,7 +281,7 @@ function page() {
                                             onChange={() => handleFilterChange('skills', 'javascript')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="javascript" className="ml-2 text-sm text-gray-700">JavaScript</label>
+                                        <label htmlFor="javascript" className="ml-2 text-sm text-gray-700">JavaScript{facetCount('skills', 'javascript')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -275,7 +292,7 @@ function page() {
                                             onChange={() => handleFilterChange('skills', 'python')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="python" className="ml-2 text-sm text-gray-700">Python</label>
+                                        <label htmlFor="python" className="ml-2 text-sm text-gray-700">Python{facetCount('skills', 'python')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -286,7 +303,7 @@ function page() {
                                             onChange={() => handleFilterChange('skills', 'react')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="react" className="ml-2 text-sm text-gray-700">React</label>
+                                        <label htmlFor="react" className="ml-2 text-sm text-gray-700">React{facetCount('skills', 'react')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -297,7 +314,7 @@ function page() {
                                             onChange={() => handleFilterChange('skills', 'nodejs')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="nodejs" className="ml-2 text-sm text-gray-700">Node.js</label>
+                                        <label htmlFor="nodejs" className="ml-2 text-sm text-gray-700">Node.js{facetCount('skills', 'nodejs')}</label>
                                     </div>
                                     <div className="flex items-center">
                                         <input 
@@ -308,7 +325,7 @@ function page() {
                                             onChange={() => handleFilterChange('skills', 'sql')}
                                             className="h-4 w-4 text-primary focus:ring-primary border-gray-300 rounded" 
                                         />
-                                        <label htmlFor="sql" className="ml-2 text-sm text-gray-700">SQL</label>
+                                        <label htmlFor="sql" className="ml-2 text-sm text-gray-700">SQL{facetCount('skills', 'sql')}</label>
                                     </div>
                                 </div>
                             </div>
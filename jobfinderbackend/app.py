@@ -1,14 +1,46 @@
-from flask import Flask, request, jsonify, g, send_from_directory
+from flask import Flask, Request, request, jsonify, g, has_request_context, send_from_directory, make_response, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
+from flask_sqlalchemy.session import Session
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
+from werkzeug.wsgi import get_input_stream
 import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 import os
+import re
+import json
+import time
+import math
+import mimetypes
+import random
+import base64
+import hashlib
+import csv
+import io
+import shutil
+import sqlite3
+import tempfile
+import zipfile
 from dotenv import load_dotenv
-import uuid
+from collections import namedtuple
+import click
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import make_transient_to_detached
+from urllib.parse import urlencode
+
+from cache import TTLCache, create_backend
+from tasks import create_queue
+from metrics import RequestMetrics
+from recommend import JobIndex
+from json_provider import create_provider
+from ratelimit import create_limiter, parse_limit
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF text extraction is optional
+    PdfReader = None
 
 load_dotenv()
 
@@ -19,15 +51,158 @@ app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev_secret_key')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URI', 'sqlite:///jobboard.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# JSON encoding for responses: 'orjson' when it is installed, or 'stdlib'
+app.config['JSON_PROVIDER'] = os.getenv('JSON_PROVIDER', 'orjson')
+app.json = create_provider(app.config['JSON_PROVIDER'], app)
+
+# Connection pool for server databases (per worker process). SQLite gets
+# connection pragmas instead, see set_sqlite_pragmas.
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True
+    }
+# Read replicas, comma separated. Queries made while handling GET requests go
+# to one replica per request, unless the request has written something.
+app.config['SQLALCHEMY_BINDS'] = {
+    f'replica_{i}': uri.strip()
+    for i, uri in enumerate(os.getenv('DATABASE_REPLICA_URIS', '').split(','))
+    if uri.strip()
+}
+app.config['READ_REPLICAS'] = list(app.config['SQLALCHEMY_BINDS'])
+app.config['SQLITE_BUSY_TIMEOUT'] = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # ms
+app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+# Schema migrations run on import; multi-process deployments should turn this
+# off and run 'flask --app app migrate' once before starting the workers
+app.config['AUTO_MIGRATE'] = os.getenv('AUTO_MIGRATE', 'true').lower() == 'true'
+
+# Authenticated user cache, so token_required doesn't query the user table on
+# every request. JWT_USER_CLAIMS puts the user record in the token itself
+# (changes then only take effect on the next login).
+app.config['AUTH_CACHE_SIZE'] = int(os.getenv('AUTH_CACHE_SIZE', 1024))
+app.config['AUTH_CACHE_TTL'] = int(os.getenv('AUTH_CACHE_TTL', 60))
+app.config['JWT_USER_CLAIMS'] = os.getenv('JWT_USER_CLAIMS', 'false').lower() == 'true'
+
+# Login and register attempts allowed per client IP and per email, as
+# 'count/seconds'. RATELIMIT_TYPE is 'memory' (per process), 'redis' (shared,
+# needs RATELIMIT_REDIS_URL) or 'null' to turn limiting off. Behind a proxy,
+# the client IP is only right if the app is wrapped in werkzeug's ProxyFix.
+app.config['RATELIMIT_TYPE'] = os.getenv('RATELIMIT_TYPE', 'memory')
+app.config['RATELIMIT_REDIS_URL'] = os.getenv('RATELIMIT_REDIS_URL', 'redis://localhost:6379/0')
+app.config['RATELIMIT_AUTH_PER_IP'] = parse_limit(os.getenv('RATELIMIT_AUTH_PER_IP', '20/60'))
+app.config['RATELIMIT_AUTH_PER_EMAIL'] = parse_limit(os.getenv('RATELIMIT_AUTH_PER_EMAIL', '5/60'))
+
+# Response cache for the public read endpoints. CACHE_TYPE is 'memory'
+# (per process), 'redis' (shared, needs CACHE_REDIS_URL) or 'null'.
+app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'memory')
+app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+app.config['CACHE_DEFAULT_TIMEOUT'] = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 60))
+app.config['CACHE_MAX_ENTRIES'] = int(os.getenv('CACHE_MAX_ENTRIES', 512))
+
+# Number of skills returned in the skills facet of GET /api/jobs?facets=true
+app.config['FACET_TOP_SKILLS'] = int(os.getenv('FACET_TOP_SKILLS', 10))
+
+# Jobs are listed for JOB_TTL_DAYS unless posted with their own expires_at.
+# Expired jobs stay in the job table for ARCHIVE_GRACE_DAYS, then
+# archive_expired_jobs moves them and their applications to the archive
+# tables, ARCHIVE_BATCH_SIZE jobs per transaction. It runs from
+# 'flask --app app archive-jobs' (e.g. from cron), or every ARCHIVE_INTERVAL
+# seconds on the queue of a 'flask --app app worker' process.
+app.config['JOB_TTL_DAYS'] = int(os.getenv('JOB_TTL_DAYS', 60))
+app.config['ARCHIVE_GRACE_DAYS'] = int(os.getenv('ARCHIVE_GRACE_DAYS', 30))
+app.config['ARCHIVE_BATCH_SIZE'] = int(os.getenv('ARCHIVE_BATCH_SIZE', 500))
+app.config['ARCHIVE_INTERVAL'] = int(os.getenv('ARCHIVE_INTERVAL', 3600))
+
+# Job recommendations: each process keeps an index of all jobs and picks up
+# changes made elsewhere at most RECOMMEND_REFRESH_INTERVAL seconds late.
+# Newer jobs score higher, halving every RECOMMEND_HALF_LIFE_DAYS.
+# Each refresh re-reads RECOMMEND_REFRESH_OVERLAP seconds before the newest
+# change it has seen, since a transaction can commit after a later one while
+# stamping an earlier updated_at; it should exceed the longest write transaction.
+app.config['RECOMMEND_REFRESH_INTERVAL'] = float(os.getenv('RECOMMEND_REFRESH_INTERVAL', 5))
+app.config['RECOMMEND_REFRESH_OVERLAP'] = float(os.getenv('RECOMMEND_REFRESH_OVERLAP', 60))
+app.config['RECOMMEND_HALF_LIFE_DAYS'] = float(os.getenv('RECOMMEND_HALF_LIFE_DAYS', 14))
+
 # File upload settings
 app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5 MB max file size
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'doc', 'docx'}
+app.config['RESUME_MAX_TEXT_BYTES'] = int(os.getenv('RESUME_MAX_TEXT_BYTES', 20 * 1024 * 1024))  # Uncompressed docx text
+
+# Bulk job import: rows per transaction (also the most a client may ask
+# for), and the upload limit for feeds (MAX_CONTENT_LENGTH is sized for resumes). Exports fetch EXPORT_BATCH_SIZE
+# rows at a time.
+app.config['IMPORT_CHUNK_SIZE'] = int(os.getenv('IMPORT_CHUNK_SIZE', 1000))
+app.config['IMPORT_MAX_CONTENT_LENGTH'] = int(os.getenv('IMPORT_MAX_CONTENT_LENGTH', 200 * 1024 * 1024))
+app.config['EXPORT_BATCH_SIZE'] = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+# Background tasks (resume processing, notifications). TASK_QUEUE_TYPE is
+# 'memory' (lost on restart) or 'sqlite' (durable, can be consumed by
+# separate 'flask --app app worker' processes). TASK_WORKERS threads run
+# tasks inside each web process, started when it serves its first request
+# (CLI commands don't run tasks); set it to 0 to leave them to workers. A
+# sqlite task still running TASK_VISIBILITY_TIMEOUT seconds after it was
+# claimed is put back in the queue.
+app.config['TASK_QUEUE_TYPE'] = os.getenv('TASK_QUEUE_TYPE', 'memory')
+app.config['TASK_QUEUE_PATH'] = os.getenv('TASK_QUEUE_PATH', os.path.join(app.instance_path, 'tasks.db'))
+app.config['TASK_WORKERS'] = int(os.getenv('TASK_WORKERS', 2))
+app.config['TASK_MAX_RETRIES'] = int(os.getenv('TASK_MAX_RETRIES', 3))
+app.config['TASK_RETRY_BACKOFF'] = float(os.getenv('TASK_RETRY_BACKOFF', 2))
+app.config['TASK_VISIBILITY_TIMEOUT'] = float(os.getenv('TASK_VISIBILITY_TIMEOUT', 300))
+
+# How resume downloads are transferred once authorized: '' streams them from
+# Python, 'x-sendfile' (Apache, lighttpd) and 'x-accel-redirect' (nginx) hand
+# the file to the front server. For nginx, RESUME_ACCEL_PREFIX is the
+# internal location aliased to UPLOAD_FOLDER/resumes.
+app.config['RESUME_SENDFILE'] = os.getenv('RESUME_SENDFILE', '')
+app.config['RESUME_ACCEL_PREFIX'] = os.getenv('RESUME_ACCEL_PREFIX', '/protected/resumes/')
+app.config['USE_X_SENDFILE'] = app.config['RESUME_SENDFILE'] == 'x-sendfile'
+
+# Statements slower than this are logged with their parameters. Set
+# METRICS_TOKEN to require it as a bearer token on /metrics.
+app.config['SLOW_QUERY_MS'] = float(os.getenv('SLOW_QUERY_MS', 200))
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
 
 # Create upload folder if it doesn't exist
-os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'resumes'), exist_ok=True)
+os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', 'tmp'), exist_ok=True)
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._read_from_replica(clause):
+            if 'replica' not in g:
+                g.replica = random.choice(app.config['READ_REPLICAS'])
+            return self._db.engines[g.replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+    
+    def _read_from_replica(self, clause):
+        if not app.config['READ_REPLICAS'] or not has_request_context():
+            return False
+        if self._flushing or getattr(clause, 'is_dml', False):
+            # Reads after a write in the same request must see it
+            g.read_from_primary = True
+            return False
+        return (request.method in ('GET', 'HEAD')
+                and getattr(clause, 'is_select', False)
+                and not g.get('read_from_primary', False))
 
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+
+# WAL lets readers run alongside a writer, and busy_timeout makes writers wait
+# for the lock instead of failing with "database is locked"
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {app.config['SQLITE_BUSY_TIMEOUT']}")
+    cursor.execute('PRAGMA journal_mode = WAL')
+    cursor.execute('PRAGMA synchronous = NORMAL')
+    cursor.execute(f"PRAGMA mmap_size = {app.config['SQLITE_MMAP_SIZE']}")
+    cursor.close()
 
 # Models
 class User(db.Model):
@@ -54,9 +229,30 @@ class Job(db.Model):
     application_url = db.Column(db.String(250), nullable=True)
     is_featured = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # The description as shown in lists, computed on write
+    summary = db.Column(db.String(210), default=lambda context: job_summary(
+        context.get_current_parameters()['description']
+    ))
+    expires_at = db.Column(db.DateTime, default=lambda: datetime.utcnow() + timedelta(days=app.config['JOB_TTL_DAYS']))
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    external_id = db.Column(db.String(120), nullable=True)  # Id in a partner feed, for imports
     skills = db.relationship('Skill', secondary='job_skills')
 
+    # Indexes follow the list queries: newest first, optionally narrowed by
+    # one equality filter
+    __table_args__ = (
+        db.Index('ix_job_created_at_id', 'created_at', 'id'),
+        db.Index('ix_job_is_featured_created_at', 'is_featured', 'created_at'),
+        db.Index('ix_job_category_created_at', 'category', 'created_at'),
+        db.Index('ix_job_job_type_created_at', 'job_type', 'created_at'),
+        db.Index('ix_job_experience_level_created_at', 'experience_level', 'created_at'),
+        db.Index('ix_job_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_job_user_id_external_id', 'user_id', 'external_id', unique=True),
+        db.Index('ix_job_updated_at', 'updated_at'),
+        db.Index('ix_job_expires_at', 'expires_at'),
+    )
+
 class Skill(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
@@ -64,8 +260,13 @@ class Skill(db.Model):
 # Association table for job skills
 job_skills = db.Table('job_skills',
     db.Column('job_id', db.Integer, db.ForeignKey('job.id'), primary_key=True),
-    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True),
+    # The primary key covers lookups by job_id; skill filters need the reverse
+    db.Index('ix_job_skills_skill_id', 'skill_id', 'job_id')
 )
+
+APPLICATION_STATUSES = ['pending', 'reviewed', 'shortlisted', 'rejected']
+
 class JobApplication(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
@@ -77,8 +278,247 @@ class JobApplication(db.Model):
     
     job = db.relationship('Job', backref='applications')
     user = db.relationship('User', backref='applications')
+
+    __table_args__ = (
+        db.Index('ix_job_application_job_id_user_id', 'job_id', 'user_id'),
+        db.Index('ix_job_application_job_id_status', 'job_id', 'status'),
+        db.Index('ix_job_application_user_id_status', 'user_id', 'status'),
+        db.Index('ix_job_application_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_job_application_resume_url', 'resume_url'),
+    )
+
+# Uploaded resumes, stored once per distinct content
+class Resume(db.Model):
+    sha256 = db.Column(db.String(64), primary_key=True)
+    path = db.Column(db.String(250), nullable=False)  # Relative to UPLOAD_FOLDER
+    size = db.Column(db.Integer, nullable=False)
+    content_type = db.Column(db.String(100), nullable=True)  # Sniffed in the background
+    text = db.Column(db.Text, nullable=True)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Archived jobs, their skills and their applications, moved out of the live
+# tables by archive_expired_jobs. The columns mirror the live table, so a
+# column added there needs adding here in the same migration. Archive rows
+# have their own key: SQLite reuses the id of the newest job once it has
+# been archived, so live ids can appear in an archive more than once.
+def archive_table(table, *indexes):
+    return db.Table(
+        f'{table.name}_archive',
+        db.Column('archive_id', db.Integer, primary_key=True),
+        *[db.Column(column.name, column.type) for column in table.columns],
+        db.Column('archived_at', db.DateTime, nullable=False),
+        *indexes
+    )
+
+job_archive = archive_table(
+    Job.__table__,
+    db.Index('ix_job_archive_id', 'id'),
+    db.Index('ix_job_archive_user_id', 'user_id')
+)
+job_skills_archive = archive_table(job_skills, db.Index('ix_job_skills_archive_job_id', 'job_id'))
+job_application_archive = archive_table(
+    JobApplication.__table__,
+    db.Index('ix_job_application_archive_job_id', 'job_id'),
+    db.Index('ix_job_application_archive_user_id', 'user_id')
+)
+
+class SchemaMigration(db.Model):
+    version = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Schema migrations
+# db.create_all() only creates missing tables, so changes to existing tables
+# (new indexes, columns) are applied here. Each migration runs once, in
+# version order, and must be safe on a database that create_all() has just
+# built from the current models.
+MIGRATIONS = []
+
+def migration(version):
+    def register(f):
+        MIGRATIONS.append((version, f))
+        return f
+    return register
+
+def create_indexes(conn, *names):
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+
+def add_column(conn, table, column, ddl):
+    if column not in {c['name'] for c in db.inspect(conn).get_columns(table)}:
+        conn.execute(db.text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+
+@migration(1)
+def create_query_indexes(conn):
+    create_indexes(
+        conn,
+        'ix_job_created_at_id',
+        'ix_job_is_featured_created_at',
+        'ix_job_category_created_at',
+        'ix_job_job_type_created_at',
+        'ix_job_experience_level_created_at',
+        'ix_job_user_id_created_at',
+        'ix_job_application_job_id_user_id',
+        'ix_job_application_job_id_status',
+        'ix_job_application_user_id_status',
+        'ix_job_application_user_id_created_at',
+        'ix_job_skills_skill_id'
+    )
+
+@migration(2)
+def add_job_external_id(conn):
+    add_column(conn, 'job', 'external_id', 'VARCHAR(120)')
+    create_indexes(conn, 'ix_job_user_id_external_id')
+
+@migration(3)
+def create_resume_url_index(conn):
+    create_indexes(conn, 'ix_job_application_resume_url')
+
+@migration(4)
+def add_job_updated_at(conn):
+    add_column(conn, 'job', 'updated_at', 'DATETIME')
+    conn.execute(db.text('UPDATE job SET updated_at = created_at WHERE updated_at IS NULL'))
+    create_indexes(conn, 'ix_job_updated_at')
+
+@migration(5)
+def add_job_summary(conn):
+    add_column(conn, 'job', 'summary', 'VARCHAR(210)')
+    # Same as job_summary
+    conn.execute(db.text(
+        "UPDATE job SET summary = CASE WHEN length(description) > 200 "
+        "THEN substr(description, 1, 200) || '...' ELSE description END "
+        "WHERE summary IS NULL"
+    ))
+
+@migration(6)
+def add_job_expiry_and_archive(conn):
+    add_column(conn, 'job', 'expires_at', 'DATETIME')
+    # Existing jobs get a full listing period from now
+    conn.execute(
+        db.text('UPDATE job SET expires_at = :expires_at WHERE expires_at IS NULL'),
+        {'expires_at': datetime.utcnow() + timedelta(days=app.config['JOB_TTL_DAYS'])}
+    )
+    create_indexes(conn, 'ix_job_expires_at')
+    for table in (job_archive, job_skills_archive, job_application_archive):
+        table.create(conn, checkfirst=True)
+
+@migration(7)
+def add_archive_ids(conn):
+    # The archive tables from migration 6 reused the live primary keys;
+    # rebuild them with archive_id, keeping their rows
+    for table in (job_archive, job_skills_archive, job_application_archive):
+        inspector = db.inspect(conn)
+        if 'archive_id' in {c['name'] for c in inspector.get_columns(table.name)}:
+            continue
+        old_name = f'{table.name}_old'
+        for index in inspector.get_indexes(table.name):
+            conn.execute(db.text(f'DROP INDEX {index["name"]}'))
+        conn.execute(db.text(f'ALTER TABLE {table.name} RENAME TO {old_name}'))
+        if conn.dialect.name == 'postgresql':
+            conn.execute(db.text(f'ALTER INDEX {table.name}_pkey RENAME TO {old_name}_pkey'))
+        table.create(conn)
+        columns = ', '.join(column.name for column in table.columns if column.name != 'archive_id')
+        conn.execute(db.text(f'INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {old_name}'))
+        conn.execute(db.text(f'DROP TABLE {old_name}'))
+
+def run_migrations():
+    applied = {version for (version,) in db.session.query(SchemaMigration.version)}
+    db.session.rollback()
+    
+    for version, f in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in applied:
+            continue
+        with db.engine.begin() as conn:
+            f(conn)
+            conn.execute(SchemaMigration.__table__.insert().values(
+                version=version, name=f.__name__, applied_at=datetime.utcnow()
+            ))
+        app.logger.info('Applied migration %s (%s)', version, f.__name__)
        
 # Helper functions
+# The part of a user the route handlers need, cached per user id
+CurrentUser = namedtuple('CurrentUser', ['id', 'email', 'is_employer', 'company_name'])
+
+user_cache = TTLCache(maxsize=app.config['AUTH_CACHE_SIZE'], ttl=app.config['AUTH_CACHE_TTL'])
+
+def load_current_user(user_id):
+    current_user = user_cache.get(user_id)
+    if current_user is None:
+        row = db.session.query(
+            User.id, User.email, User.is_employer, User.company_name
+        ).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        current_user = CurrentUser(*row)
+        user_cache.set(user_id, current_user)
+    return current_user
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, user):
+    user_cache.delete(user.id)
+
+response_cache = create_backend(
+    app.config['CACHE_TYPE'],
+    maxsize=app.config['CACHE_MAX_ENTRIES'],
+    ttl=app.config['CACHE_DEFAULT_TIMEOUT'],
+    redis_url=app.config['CACHE_REDIS_URL']
+)
+
+# Cache successful responses by path and normalized query string, and answer
+# If-None-Match revalidation with 304. Anything that changes jobs or skills
+# must call response_cache.clear().
+def cached_response(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        # Empty values are dropped, except cursor where empty means the first page
+        query_args = sorted((k, v) for k, v in request.args.items(multi=True) if v != '' or k == 'cursor')
+        key = f'{request.path}?{urlencode(query_args)}'
+        
+        cached = response_cache.get(key)
+        if cached is not None:
+            etag, _, body = cached.partition(b'\n')
+            response = app.response_class(body, mimetype='application/json')
+            response.set_etag(etag.decode())
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            response_cache.set(key, etag.encode() + b'\n' + body)
+            response.set_etag(etag)
+        
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    return decorated
+
+rate_limiter = create_limiter(app.config['RATELIMIT_TYPE'], redis_url=app.config['RATELIMIT_REDIS_URL'])
+
+# Throttles credential endpoints by client IP and by the email in the body,
+# before the handler queries the user table or hashes a password
+def auth_rate_limited(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        limits = [(f'{request.endpoint}:ip:{request.remote_addr}', app.config['RATELIMIT_AUTH_PER_IP'])]
+        data = request.get_json(silent=True)
+        email = data.get('email') if isinstance(data, dict) else None
+        if isinstance(email, str) and email.strip():
+            limits.append((f'{request.endpoint}:email:{email.strip().lower()}', app.config['RATELIMIT_AUTH_PER_EMAIL']))
+        
+        for key, (count, window) in limits:
+            allowed, retry_after = rate_limiter.hit(key, count, window)
+            if not allowed:
+                response = jsonify({'message': 'Too many attempts, please try again later'})
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response, 429
+        
+        return f(*args, **kwargs)
+    return decorated
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -93,30 +533,866 @@ def token_required(f):
         
         try:
             data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=["HS256"])
-            current_user = User.query.get(data['user_id'])
+            if app.config['JWT_USER_CLAIMS'] and 'is_employer' in data:
+                current_user = CurrentUser(
+                    data['user_id'], data['email'], data['is_employer'], data['company_name']
+                )
+            else:
+                current_user = load_current_user(data['user_id'])
             g.current_user = current_user
         except:
             return jsonify({'message': 'Token is invalid'}), 401
         
+        if g.current_user is None:
+            return jsonify({'message': 'Token is invalid'}), 401
+        
         return f(*args, **kwargs)
     return decorated
 
+# Skill rows are never renamed or deleted, so name -> id lookups can be
+# cached for a long time
+skill_cache = TTLCache(maxsize=4096, ttl=3600)
+
+def insert_ignoring_conflicts(model):
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return db.insert(model)
+    return insert(model).on_conflict_do_nothing()
+
 def add_or_get_skills(skill_names):
+    names = list(dict.fromkeys(name.strip().lower() for name in skill_names if name.strip()))
+    
+    skill_ids = {}
+    for name in names:
+        skill_id = skill_cache.get(name)
+        if skill_id is not None:
+            skill_ids[name] = skill_id
+    
+    missing = [name for name in names if name not in skill_ids]
+    if missing:
+        # Only ids of rows that already existed are cached; rows inserted here
+        # aren't committed yet and would go stale on rollback
+        for skill_id, name in db.session.execute(
+            db.select(Skill.id, Skill.name).where(Skill.name.in_(missing))
+        ):
+            skill_ids[name] = skill_id
+            skill_cache.set(name, skill_id)
+        
+        new_names = [name for name in missing if name not in skill_ids]
+        if new_names:
+            # A concurrent request may insert the same skill; ignore the
+            # conflict instead of failing the whole job, then look it up
+            inserted = db.session.execute(
+                insert_ignoring_conflicts(Skill)
+                .values([{'name': name} for name in new_names])
+                .returning(Skill.id, Skill.name)
+            )
+            for skill_id, name in inserted:
+                skill_ids[name] = skill_id
+            
+            raced = [name for name in new_names if name not in skill_ids]
+            if raced:
+                for skill_id, name in db.session.execute(
+                    db.select(Skill.id, Skill.name).where(Skill.name.in_(raced))
+                ):
+                    skill_ids[name] = skill_id
+    
+    # Attach by primary key without loading the rows again
     skills = []
-    for name in skill_names:
-        skill = Skill.query.filter_by(name=name.strip().lower()).first()
-        if not skill:
-            skill = Skill(name=name.strip().lower())
-            db.session.add(skill)
-        skills.append(skill)
+    for name in names:
+        skill = Skill(id=skill_ids[name], name=name)
+        make_transient_to_detached(skill)
+        skills.append(db.session.merge(skill, load=False))
     return skills
 
+# Full-text search over job title, company and description.
+# SQLite uses an external-content FTS5 table kept in sync by triggers,
+# Postgres uses a GIN expression index over a tsvector.
+SEARCH_BACKEND = None
+
+JOB_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(
+        title, company_name, description,
+        content='job', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS job_fts_ai AFTER INSERT ON job BEGIN
+        INSERT INTO job_fts(rowid, title, company_name, description)
+        VALUES (new.id, new.title, new.company_name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_fts_ad AFTER DELETE ON job BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company_name, description)
+        VALUES ('delete', old.id, old.title, old.company_name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_fts_au AFTER UPDATE OF title, company_name, description ON job BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company_name, description)
+        VALUES ('delete', old.id, old.title, old.company_name, old.description);
+        INSERT INTO job_fts(rowid, title, company_name, description)
+        VALUES (new.id, new.title, new.company_name, new.description);
+    END""",
+]
+
+JOB_TSVECTOR_SQL = (
+    "to_tsvector('english', coalesce(job.title, '') || ' ' || "
+    "coalesce(job.company_name, '') || ' ' || coalesce(job.description, ''))"
+)
+
+def init_search_index():
+    global SEARCH_BACKEND
+    dialect = db.engine.dialect.name
+    with db.engine.begin() as conn:
+        # Before the first migrate there is nothing to index yet
+        if not db.inspect(conn).has_table('job'):
+            return
+        if dialect == 'sqlite':
+            try:
+                for statement in JOB_FTS_DDL:
+                    conn.execute(db.text(statement))
+            except db.exc.OperationalError as e:
+                if 'no such module: fts5' not in str(e.orig):
+                    raise
+                # SQLite built without FTS5, keyword search falls back to LIKE
+                SEARCH_BACKEND = None
+                return
+            configured = conn.execute(db.text("SELECT 1 FROM job_fts_config WHERE k = 'rank'")).first()
+            if not configured:
+                # Index postings that predate the FTS table, and weight
+                # title and company matches above the description
+                conn.execute(db.text("INSERT INTO job_fts(job_fts) VALUES ('rebuild')"))
+                conn.execute(db.text(
+                    "INSERT INTO job_fts(job_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')"
+                ))
+            SEARCH_BACKEND = 'fts5'
+        elif dialect == 'postgresql':
+            conn.execute(db.text(
+                f"CREATE INDEX IF NOT EXISTS ix_job_search ON job USING GIN ({JOB_TSVECTOR_SQL})"
+            ))
+            SEARCH_BACKEND = 'tsvector'
+
+def search_terms(keyword):
+    return re.findall(r'\w+', keyword.lower())
+
+def apply_keyword_search(query, keyword, ranked=False):
+    terms = search_terms(keyword)
+    if not terms:
+        return query
+
+    if SEARCH_BACKEND == 'fts5':
+        # Every term must match, as a prefix so "develop" still finds "developer"
+        match = ' '.join(f'"{term}"*' for term in terms)
+        fts = db.select(
+            db.literal_column('rowid').label('job_id'),
+            db.literal_column('rank').label('rank')
+        ).select_from(db.table('job_fts')).where(
+            db.literal_column('job_fts').op('MATCH')(match)
+        ).subquery()
+        query = query.join(fts, fts.c.job_id == Job.id)
+        if ranked:
+            query = query.order_by(fts.c.rank)
+        return query
+
+    if SEARCH_BACKEND == 'tsvector':
+        tsquery = db.func.to_tsquery('english', ' & '.join(f'{term}:*' for term in terms))
+        vector = db.literal_column(JOB_TSVECTOR_SQL)
+        query = query.filter(vector.op('@@')(tsquery))
+        if ranked:
+            query = query.order_by(db.func.ts_rank(vector, tsquery).desc())
+        return query
+
+    return query.filter(Job.title.ilike(f'%{keyword}%') |
+                        Job.description.ilike(f'%{keyword}%') |
+                        Job.company_name.ilike(f'%{keyword}%'))
+
+def apply_skills_filter(query, skill_names, match_all=True):
+    names = {name.strip().lower() for name in skill_names if name.strip()}
+    if not names:
+        return query
+
+    # Unknown skill names are ignored, so "all" means all of the requested
+    # skills that exist
+    skill_ids = db.session.scalars(db.select(Skill.id).where(Skill.name.in_(names))).all()
+    if not skill_ids:
+        return query
+
+    matching = db.select(job_skills.c.job_id).where(
+        job_skills.c.skill_id.in_(skill_ids)
+    ).group_by(job_skills.c.job_id)
+    if match_all:
+        matching = matching.having(db.func.count(job_skills.c.skill_id) == len(skill_ids))
+
+    return query.filter(Job.id.in_(matching))
+
+# Opaque keyset cursors over (created_at, id). Unlike OFFSET pagination the
+# cost of a page doesn't grow with its depth, and no COUNT(*) is needed.
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_cursor(token):
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def keyset_paginate(query, model, cursor, per_page):
+    query = query.order_by(None).order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            (model.created_at < created_at) |
+            ((model.created_at == created_at) & (model.id < row_id))
+        )
+
+    # Fetch one extra row to find out whether there is a next page
+    items = query.limit(per_page + 1).all()
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return items, next_cursor
+
+def job_summary(description):
+    return description[:200] + '...' if len(description) > 200 else description
+
+# Build the API representation of a job. Expects job.skills to be loaded up
+# front (see with_skills) so serializing a page doesn't query per row.
+def serialize_job(job, detail=False):
+    job_data = {
+        'id': job.id,
+        'title': job.title,
+        'company_name': job.company_name,
+        'location': job.location,
+        'is_remote': job.is_remote,
+        'job_type': job.job_type,
+        'category': job.category,
+        'experience_level': job.experience_level,
+        'min_salary': job.min_salary,
+        'max_salary': job.max_salary,
+        'description': job.description if detail else job.summary,
+        'is_featured': job.is_featured,
+        'created_at': job.created_at.isoformat(),
+        'skills': [skill.name for skill in job.skills]
+    }
+    if detail:
+        job_data['application_url'] = job.application_url
+        job_data['employer_id'] = job.user_id
+        job_data['expires_at'] = job.expires_at.isoformat() if job.expires_at else None
+    return job_data
+
+def with_skills(query):
+    # One extra IN query for the skills of every job in the result
+    return query.options(db.selectinload(Job.skills))
+
+# Public listings only show jobs that haven't expired
+def active_jobs(query):
+    return query.filter(Job.expires_at > datetime.utcnow())
+
+def parse_expires_at(value):
+    # ISO 8601, stored as naive UTC like the other timestamps
+    try:
+        expires_at = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError('expires_at must be an ISO 8601 date')
+    if expires_at.tzinfo:
+        expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return expires_at
+
+# Job lists select just these columns as plain rows, rather than loading
+# whole Job entities with their full descriptions
+JOB_LIST_COLUMNS = (
+    Job.id, Job.title, Job.company_name, Job.location, Job.is_remote, Job.job_type, Job.category,
+    Job.experience_level, Job.min_salary, Job.max_salary, Job.summary, Job.is_featured, Job.created_at
+)
+
+def serialize_job_rows(rows):
+    # Skills for the whole page in one query
+    skills = {}
+    if rows:
+        for job_id, name in db.session.execute(
+            db.select(job_skills.c.job_id, Skill.name)
+            .join(Skill, Skill.id == job_skills.c.skill_id)
+            .where(job_skills.c.job_id.in_([row.id for row in rows]))
+        ):
+            skills.setdefault(job_id, []).append(name)
+    
+    return [{
+        'id': row.id,
+        'title': row.title,
+        'company_name': row.company_name,
+        'location': row.location,
+        'is_remote': row.is_remote,
+        'job_type': row.job_type,
+        'category': row.category,
+        'experience_level': row.experience_level,
+        'min_salary': row.min_salary,
+        'max_salary': row.max_salary,
+        'description': row.summary,
+        'is_featured': row.is_featured,
+        'created_at': row.created_at,
+        'skills': skills.get(row.id, [])
+    } for row in rows]
+
+# Filter counts for the jobs page. One GROUP BY over the filtered jobs yields
+# a row per (category, job_type, experience_level, is_remote) combination,
+# which is summed per column; a second grouped query counts the top skills,
+# plus any skills named in facet_skills. job_type, experience and skills in
+# "any" mode are OR filters, so each of those facets is counted with every
+# filter except its own, to show what ticking another option would give.
+# Facets don't depend on the page, so they are cached by filters alone.
+FACET_FILTER_ARGS = ('keyword', 'location', 'category', 'job_type', 'experience', 'skills', 'skills_match',
+                     'facet_skills')
+
+def facet_counts(counts):
+    return [{'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))]
+
+def apply_filters(query, filters, exclude=None):
+    for name, apply in filters.items():
+        if name != exclude:
+            query = apply(query)
+    return query.order_by(None)
+
+def job_facets(query, filters):
+    filter_args = sorted((k, v) for k, v in request.args.items(multi=True) if k in FACET_FILTER_ARGS and v != '')
+    key = f'facets?{urlencode(filter_args)}'
+    cached = response_cache.get(key)
+    if cached is not None:
+        return app.json.loads(cached)
+
+    filtered = apply_filters(query, filters)
+    columns = (Job.category, Job.job_type, Job.experience_level, Job.is_remote)
+    counts = {column.key: {} for column in columns}
+    for *values, count in filtered.with_entities(*columns, db.func.count(Job.id)).group_by(*columns):
+        for column, value in zip(columns, values):
+            counts[column.key][value] = counts[column.key].get(value, 0) + count
+    for name, column in (('job_type', Job.job_type), ('experience', Job.experience_level)):
+        if name in filters:
+            counts[column.key] = dict(
+                apply_filters(query, filters, exclude=name)
+                .with_entities(column, db.func.count(Job.id)).group_by(column).all()
+            )
+
+    skills_matching = filtered
+    if request.args.get('skills_match') == 'any':
+        skills_matching = apply_filters(query, filters, exclude='skills')
+    skill_count = db.func.count(job_skills.c.job_id)
+    skill_counts = db.select(Skill.name, skill_count).join(job_skills, job_skills.c.skill_id == Skill.id).where(
+        job_skills.c.job_id.in_(skills_matching.with_entities(Job.id))
+    ).group_by(Skill.name)
+    skills = dict(db.session.execute(
+        skill_counts.order_by(skill_count.desc(), Skill.name).limit(app.config['FACET_TOP_SKILLS'])
+    ).all())
+    named = {name.strip().lower() for name in request.args.getlist('facet_skills') if name.strip()} - set(skills)
+    if named:
+        skills.update({name: 0 for name in named})
+        skills.update(db.session.execute(skill_counts.where(Skill.name.in_(named))).all())
+
+    facets = {
+        'category': facet_counts(counts['category']),
+        'job_type': facet_counts(counts['job_type']),
+        'experience_level': facet_counts(counts['experience_level']),
+        'is_remote': facet_counts({'true': counts['is_remote'].get(True, 0),
+                                   'false': counts['is_remote'].get(False, 0)}),
+        'skills': facet_counts(skills)
+    }
+    response_cache.set(key, app.json.dumps(facets).encode())
+    return facets
+
+job_index = JobIndex(half_life_days=app.config['RECOMMEND_HALF_LIFE_DAYS'])
+
+def utc_timestamp(value):
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else None
+
+# Loads jobs changed since the last refresh into job_index (everything on the
+# first call), and drops deleted jobs when the job count no longer matches. If
+# jobs are still missing after that, the next call reloads everything.
+# Writes in this process call job_index.mark_stale() to refresh on next use.
+def refresh_job_index():
+    now = time.time()
+    if now - job_index.refreshed_at < app.config['RECOMMEND_REFRESH_INTERVAL']:
+        return
+    job_index.refreshed_at = now
+    
+    changed = db.select(Job.id)
+    if job_index.watermark is not None:
+        overlap = timedelta(seconds=app.config['RECOMMEND_REFRESH_OVERLAP'])
+        changed = changed.where(Job.updated_at >= job_index.watermark - overlap)
+    jobs = db.session.execute(
+        db.select(Job.id, Job.category, Job.experience_level, Job.created_at, Job.expires_at, Job.updated_at)
+        .where(Job.id.in_(changed))
+    ).all()
+    if jobs:
+        links = db.session.execute(
+            db.select(job_skills.c.job_id, job_skills.c.skill_id).where(job_skills.c.job_id.in_(changed))
+        ).all()
+        job_index.upsert([
+            (job.id, job.category, job.experience_level, utc_timestamp(job.created_at), utc_timestamp(job.expires_at))
+            for job in jobs
+        ], links)
+        job_index.watermark = max((job.updated_at for job in jobs if job.updated_at), default=job_index.watermark)
+    
+    count = db.session.scalar(db.select(db.func.count(Job.id)))
+    if count != len(job_index):
+        job_index.retain(db.session.scalars(db.select(Job.id)).all())
+        if count > len(job_index):
+            job_index.watermark = None
+            job_index.mark_stale()
+
+# Applications are listed as flat rows joined to their job and applicant,
+# selecting only the columns that end up in the response.
+def application_rows(*extra_columns):
+    return db.session.query(
+        JobApplication.id,
+        JobApplication.job_id,
+        Job.title.label('job_title'),
+        Job.company_name,
+        JobApplication.user_id,
+        User.email.label('user_email'),
+        JobApplication.resume_url,
+        JobApplication.status,
+        JobApplication.created_at,
+        *extra_columns
+    ).join(Job, Job.id == JobApplication.job_id).join(User, User.id == JobApplication.user_id)
+
+def serialize_application(row, detail=False):
+    application_data = {
+        'id': row.id,
+        'job_id': row.job_id,
+        'job_title': row.job_title,
+        'company_name': row.company_name,
+        'user_id': row.user_id,
+        'user_email': row.user_email,
+        'resume_url': row.resume_url,
+        'status': row.status,
+        'created_at': row.created_at.isoformat()
+    }
+    if detail:
+        application_data['cover_letter'] = row.cover_letter
+    return application_data
+
+def application_status_counts(query):
+    counts = dict.fromkeys(APPLICATION_STATUSES, 0)
+    for status, count in db.session.execute(query.group_by(JobApplication.status)):
+        if status in counts:
+            counts[status] = count
+    return counts
+
+# Bulk job import
+# Feed rows use the same field names as POST /api/jobs, plus an optional
+# external_id. Rows with an external_id already imported by the same
+# employer update that job instead of creating a new one.
+IMPORT_REQUIRED_FIELDS = ['job_title', 'location', 'job_type', 'category', 'experience', 'description']
+IMPORT_OPTIONAL_STRING_FIELDS = ['company_name', 'application_url', 'external_id']
+
+def read_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+def parse_salary(value, field):
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be an integer')
+
+def parse_import_row(row, employer):
+    if isinstance(row, str):
+        try:
+            row = json.loads(row)
+        except ValueError:
+            raise ValueError('Invalid JSON')
+    if not isinstance(row, dict):
+        raise ValueError('Row must be an object')
+    
+    missing = [field for field in IMPORT_REQUIRED_FIELDS if not row.get(field)]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    invalid = [field for field in IMPORT_REQUIRED_FIELDS + IMPORT_OPTIONAL_STRING_FIELDS
+               if row.get(field) is not None and not isinstance(row[field], str)]
+    if invalid:
+        raise ValueError(f"Fields must be strings: {', '.join(invalid)}")
+    
+    skills = row.get('skills') or []
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    elif not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError('skills must be a string or a list of strings')
+    
+    values = {
+        'title': row['job_title'],
+        'company_name': row.get('company_name') or employer.company_name,
+        'location': row['location'],
+        'is_remote': 'remote' in row['location'].lower(),
+        'job_type': row['job_type'],
+        'category': row['category'],
+        'experience_level': row['experience'],
+        'min_salary': parse_salary(row.get('min_salary'), 'min_salary'),
+        'max_salary': parse_salary(row.get('max_salary'), 'max_salary'),
+        'description': row['description'],
+        'summary': job_summary(row['description']),
+        'application_url': row.get('application_url') or None,
+        'is_featured': row.get('plan') in ['premium', 'enterprise'],
+        'user_id': employer.id,
+        'external_id': row.get('external_id') or None,
+        # A job that is still in the feed is listed for another period
+        'expires_at': (parse_expires_at(row['expires_at']) if row.get('expires_at')
+                       else datetime.utcnow() + timedelta(days=app.config['JOB_TTL_DAYS']))
+    }
+    if not values['company_name']:
+        raise ValueError('Missing required fields: company_name')
+    return values, skills
+
+def import_job_chunk(chunk, employer, report):
+    rows = []
+    by_external_id = {}
+    for row_number, row in chunk:
+        try:
+            values, skill_names = parse_import_row(row, employer)
+        except ValueError as e:
+            report['failed'] += 1
+            report['errors'].append({'row': row_number, 'error': str(e)})
+            continue
+        
+        # The last row for an external id within a chunk wins
+        external_id = values['external_id']
+        if external_id in by_external_id:
+            rows[by_external_id[external_id]] = None
+            report['skipped'] += 1
+        if external_id:
+            by_external_id[external_id] = len(rows)
+        rows.append((row_number, values, skill_names))
+    
+    rows = [row for row in rows if row is not None]
+    if not rows:
+        return
+    
+    try:
+        existing = {}
+        if by_external_id:
+            existing = dict(db.session.execute(
+                db.select(Job.external_id, Job.id).where(
+                    Job.user_id == employer.id,
+                    Job.external_id.in_(list(by_external_id))
+                )
+            ).all())
+        
+        # Skills for the whole chunk in one batch
+        skill_ids = {
+            skill.name: skill.id
+            for skill in add_or_get_skills([name for _, _, names in rows for name in names])
+        }
+        
+        updates = [dict(values, id=existing[values['external_id']])
+                   for _, values, _ in rows if values['external_id'] in existing]
+        inserts = [values for _, values, _ in rows if values['external_id'] not in existing]
+        
+        if updates:
+            db.session.execute(db.update(Job), updates)
+            db.session.execute(job_skills.delete().where(
+                job_skills.c.job_id.in_([values['id'] for values in updates])
+            ))
+        inserted_ids = []
+        if inserts:
+            inserted_ids = db.session.scalars(
+                db.insert(Job).returning(Job.id, sort_by_parameter_order=True), inserts
+            ).all()
+        
+        job_ids = iter(inserted_ids)
+        links = set()
+        for _, values, skill_names in rows:
+            if values['external_id'] in existing:
+                job_id = existing[values['external_id']]
+            else:
+                job_id = next(job_ids)
+            for name in skill_names:
+                name = name.strip().lower()
+                if name:
+                    links.add((job_id, skill_ids[name]))
+        if links:
+            db.session.execute(job_skills.insert(), [
+                {'job_id': job_id, 'skill_id': skill_id} for job_id, skill_id in links
+            ])
+        
+        db.session.commit()
+    except db.exc.SQLAlchemyError as e:
+        db.session.rollback()
+        app.logger.exception('Job import chunk failed')
+        report['failed'] += len(rows)
+        report['errors'].extend({'row': row_number, 'error': type(e).__name__} for row_number, _, _ in rows)
+        return
+    
+    report['created'] += len(inserts)
+    report['updated'] += len(updates)
+
+def import_jobs(rows, employer, chunk_size=None):
+    chunk_size = chunk_size or app.config['IMPORT_CHUNK_SIZE']
+    report = {'created': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    
+    chunk = []
+    for row_number, row in enumerate(rows, 1):
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            import_job_chunk(chunk, employer, report)
+            chunk = []
+    if chunk:
+        import_job_chunk(chunk, employer, report)
+    
+    if report['created'] or report['updated']:
+        response_cache.clear()
+        job_index.mark_stale()
+    return report
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+# Resume uploads
+# Multipart file parts with an allowed extension are written straight to a
+# temporary file next to their final location, hashing as they arrive,
+# instead of being spooled and copied by FileStorage.save().
+class HashingUpload:
+    def __init__(self, directory):
+        self.file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        g.setdefault('uploads', []).append(self)
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+    
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and allowed_file(filename):
+            return HashingUpload(os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', 'tmp'))
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+app.request_class = UploadRequest
+
+@app.teardown_request
+def remove_unsaved_uploads(exc):
+    for upload in g.pop('uploads', []):
+        upload.file.close()
+        if os.path.exists(upload.file.name):
+            os.remove(upload.file.name)
+
+# Move an upload to resumes/<aa>/<bb>/<sha256>.<ext>. Content that was
+# uploaded before reuses the stored copy.
+def store_resume(resume_file):
+    upload = resume_file.stream
+    if not isinstance(upload, HashingUpload):
+        upload = HashingUpload(os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', 'tmp'))
+        shutil.copyfileobj(resume_file.stream, upload)
+    upload.file.close()
+    
+    digest = upload.sha256.hexdigest()
+    resume = db.session.get(Resume, digest)
+    if resume is None:
+        extension = resume_file.filename.rsplit('.', 1)[1].lower()
+        path = '/'.join(['resumes', digest[:2], digest[2:4], f'{digest}.{extension}'])
+        full_path = os.path.join(app.config['UPLOAD_FOLDER'], *path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        os.replace(upload.file.name, full_path)
+        # Two uploads of the same file can both get here; the first insert
+        # wins and both applications point at its row
+        db.session.execute(insert_ignoring_conflicts(Resume).values(sha256=digest, path=path, size=upload.size))
+        resume = db.session.get(Resume, digest)
+    return resume
+
+def sniff_content_type(head):
+    if head.startswith(b'%PDF-'):
+        return 'application/pdf'
+    if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return 'application/msword'
+    if head.startswith(b'PK\x03\x04'):
+        return 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    return 'application/octet-stream'
+
+def extract_resume_text(path, content_type):
+    if content_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
+        # The archive's sizes can't be trusted, so stop reading past the cap
+        # rather than inflating a zip bomb into memory
+        limit = app.config['RESUME_MAX_TEXT_BYTES']
+        with zipfile.ZipFile(path) as docx, docx.open('word/document.xml') as f:
+            document = f.read(limit + 1)
+        if len(document) > limit:
+            raise ValueError(f'word/document.xml is larger than {limit} bytes')
+        document = document.decode('utf-8', 'replace')
+        return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', ' ', document)).strip()
+    if content_type == 'application/pdf' and PdfReader is not None:
+        return '\n'.join(page.extract_text() or '' for page in PdfReader(path).pages).strip()
+    return None
+
+# Background tasks
+# Routes enqueue follow-up work after their commit instead of doing it inline
+os.makedirs(app.instance_path, exist_ok=True)
+task_queue = create_queue(
+    app.config['TASK_QUEUE_TYPE'],
+    path=app.config['TASK_QUEUE_PATH'],
+    visibility_timeout=app.config['TASK_VISIBILITY_TIMEOUT'],
+    max_retries=app.config['TASK_MAX_RETRIES'],
+    backoff=app.config['TASK_RETRY_BACKOFF'],
+    context=app.app_context
+)
+
+@task_queue.task
+def process_resume(sha256):
+    resume = db.session.get(Resume, sha256)
+    if resume is None or resume.processed_at:
+        return
+    path = os.path.join(app.config['UPLOAD_FOLDER'], *resume.path.split('/'))
+    with open(path, 'rb') as f:
+        resume.content_type = sniff_content_type(f.read(8))
+    try:
+        resume.text = extract_resume_text(path, resume.content_type)
+    except Exception:
+        # A corrupt document won't parse on a retry either
+        app.logger.exception('Could not extract text from resume %s', sha256)
+    resume.processed_at = datetime.utcnow()
+    db.session.commit()
+
+# Notification hooks; delivery (email, webhooks) plugs in here
+@task_queue.task
+def notify_new_application(application_id):
+    row = db.session.query(Job.title, Job.user_id).join(
+        JobApplication, JobApplication.job_id == Job.id
+    ).filter(JobApplication.id == application_id).first()
+    if row:
+        app.logger.info('New application %s for job "%s" (employer %s)', application_id, row.title, row.user_id)
+
+@task_queue.task
+def notify_application_status(application_id, status):
+    user_id = db.session.query(JobApplication.user_id).filter(JobApplication.id == application_id).scalar()
+    if user_id:
+        app.logger.info('Application %s is now %s (applicant %s)', application_id, status, user_id)
+
+# Moves jobs that expired more than ARCHIVE_GRACE_DAYS ago, with their skills
+# and applications, into the archive tables. Each batch is copied with
+# INSERT ... SELECT and deleted in one transaction, so an interrupted run
+# leaves nothing half moved and the next run picks up where it stopped.
+ARCHIVED_TABLES = (
+    (JobApplication.__table__, job_application_archive, 'job_id'),
+    (job_skills, job_skills_archive, 'job_id'),
+    (Job.__table__, job_archive, 'id'),
+)
+
+@task_queue.task
+def archive_expired_jobs(batch_size=None):
+    batch_size = batch_size or app.config['ARCHIVE_BATCH_SIZE']
+    cutoff = datetime.utcnow() - timedelta(days=app.config['ARCHIVE_GRACE_DAYS'])
+    archived = {'jobs': 0, 'applications': 0}
+    
+    while True:
+        # Jobs another run is archiving are locked and skipped on Postgres;
+        # SQLite allows one writer anyway
+        job_ids = db.session.scalars(
+            db.select(Job.id).where(Job.expires_at < cutoff).order_by(Job.expires_at).limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not job_ids:
+            break
+        
+        archived_at = db.literal(datetime.utcnow(), db.DateTime)
+        try:
+            for table, archive, key in ARCHIVED_TABLES:
+                db.session.execute(archive.insert().from_select(
+                    [column.name for column in table.columns] + ['archived_at'],
+                    db.select(*table.columns, archived_at).where(table.c[key].in_(job_ids))
+                ))
+            deleted = {}
+            for table, _, key in ARCHIVED_TABLES:
+                deleted[table] = db.session.execute(table.delete().where(table.c[key].in_(job_ids))).rowcount
+            db.session.commit()
+        except db.exc.SQLAlchemyError:
+            db.session.rollback()
+            raise
+        archived['jobs'] += deleted[Job.__table__]
+        archived['applications'] += deleted[JobApplication.__table__]
+    
+    if archived['jobs']:
+        response_cache.clear()
+        job_index.mark_stale()
+        app.logger.info('Archived %s jobs and %s applications', archived['jobs'], archived['applications'])
+    return archived
+
+# Task threads start with the first request rather than on import, so CLI
+# commands and a preloading server's master process never claim tasks
+@app.before_request
+def start_task_workers():
+    task_queue.start(app.config['TASK_WORKERS'])
+
+# Instrumentation
+# Per-endpoint latency, SQL statement counts and database time, collected per
+# process and exposed on /metrics with a pid label; sum over pid for totals
+request_metrics = RequestMetrics()
+
+def metrics_endpoint():
+    return request.endpoint or 'unmatched'
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.query_count = 0
+    g.db_seconds = 0.0
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' in g:
+        request_metrics.observe_request(
+            metrics_endpoint(), request.method, response.status_code,
+            time.perf_counter() - g.request_started, g.query_count, g.db_seconds
+        )
+    return response
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    if has_request_context() and 'request_started' in g:
+        g.query_count += 1
+        g.db_seconds += elapsed
+    if elapsed * 1000 >= app.config['SLOW_QUERY_MS']:
+        endpoint = metrics_endpoint() if has_request_context() else 'none'
+        request_metrics.observe_slow_query(endpoint)
+        app.logger.warning('Slow query (%.1f ms, %s): %s %r', elapsed * 1000, endpoint, statement, parameters)
+
 # Routes
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    token = app.config['METRICS_TOKEN']
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'message': 'Token is invalid'}), 401
+    
+    # Queue depth and the longest run are gauges, everything else only grows
+    counters, gauges = {}, {}
+    for name, value in task_queue.metrics().items():
+        metric = (f'Task queue {name.replace("_", " ").removesuffix(" total")}.', value)
+        if name in ('depth', 'run_seconds_max'):
+            gauges[f'task_queue_{name}'] = metric
+        else:
+            counters[f'task_queue_{name.removesuffix("_total")}_total'] = metric
+    return app.response_class(request_metrics.render(counters, gauges), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/register', methods=['POST'])
+@auth_rate_limited
 def register():
     data = request.get_json()
     
@@ -139,6 +1415,7 @@ def register():
     return jsonify({'message': 'User created successfully'}), 201
 
 @app.route('/api/login', methods=['POST'])
+@auth_rate_limited
 def login():
     data = request.get_json()
     
@@ -147,10 +1424,17 @@ def login():
     if not user or not check_password_hash(user.password, data['password']):
         return jsonify({'message': 'Invalid credentials'}), 401
     
-    token = jwt.encode({
+    claims = {
         'user_id': user.id,
         'exp': datetime.utcnow() + timedelta(days=1)
-    }, app.config['SECRET_KEY'])
+    }
+    if app.config['JWT_USER_CLAIMS']:
+        claims.update({
+            'email': user.email,
+            'is_employer': user.is_employer,
+            'company_name': user.company_name
+        })
+    token = jwt.encode(claims, app.config['SECRET_KEY'])
     
     return jsonify({
         'token': token,
@@ -161,126 +1445,103 @@ def login():
     })
 
 @app.route('/api/jobs', methods=['GET'])
+@cached_response
 def get_jobs():
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
     
     # Search parameters
     keyword = request.args.get('keyword', '')
+    sort = request.args.get('sort', 'recent')
     location = request.args.get('location', '')
     category = request.args.get('category', '')
     job_type = request.args.getlist('job_type')
     experience = request.args.getlist('experience')
     skills = request.args.getlist('skills')
+    skills_match = request.args.get('skills_match', 'all')
     
     # Base query
-    query = Job.query
+    query = active_jobs(db.session.query(*JOB_LIST_COLUMNS))
     
-    # Apply filters
+    # Filters, by facet name so facets can leave their own out
+    filters = {}
     if keyword:
-        query = query.filter(Job.title.ilike(f'%{keyword}%') | 
-                            Job.description.ilike(f'%{keyword}%') | 
-                            Job.company_name.ilike(f'%{keyword}%'))
+        filters['keyword'] = lambda q: apply_keyword_search(q, keyword, ranked=(sort == 'relevance'))
     
     if location:
         if location.lower() == 'remote':
-            query = query.filter(Job.is_remote == True)
+            filters['location'] = lambda q: q.filter(Job.is_remote == True)
         else:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
+            filters['location'] = lambda q: q.filter(Job.location.ilike(f'%{location}%'))
     
     if category:
-        query = query.filter(Job.category == category)
+        filters['category'] = lambda q: q.filter(Job.category == category)
     
     if job_type:
-        query = query.filter(Job.job_type.in_(job_type))
+        filters['job_type'] = lambda q: q.filter(Job.job_type.in_(job_type))
     
     if experience:
-        query = query.filter(Job.experience_level.in_(experience))
+        filters['experience'] = lambda q: q.filter(Job.experience_level.in_(experience))
     
     if skills:
-        for skill in skills:
-            skill_obj = Skill.query.filter_by(name=skill.lower()).first()
-            if skill_obj:
-                query = query.filter(Job.skills.contains(skill_obj))
+        filters['skills'] = lambda q: apply_skills_filter(q, skills, match_all=(skills_match != 'any'))
+    
+    facets = job_facets(query, filters) if request.args.get('facets') == 'true' else None
+    
+    for apply in filters.values():
+        query = apply(query)
     
     # Order by most recent
     query = query.order_by(Job.created_at.desc())
     
+    # Cursor mode, for infinite scroll: constant cost per page, total on request
+    if 'cursor' in request.args:
+        if sort == 'relevance':
+            return jsonify({'message': 'Cursor pagination only supports the recent sort order'}), 400
+        try:
+            items, next_cursor = keyset_paginate(query, Job, request.args['cursor'], per_page)
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), 400
+        
+        result = {
+            'jobs': serialize_job_rows(items),
+            'next_cursor': next_cursor
+        }
+        if request.args.get('include_total') == 'true':
+            result['total'] = query.order_by(None).count()
+        if facets is not None:
+            result['facets'] = facets
+        return jsonify(result)
+    
     # Paginate results
     jobs_page = query.paginate(page=page, per_page=per_page, error_out=False)
     
-    jobs = []
-    for job in jobs_page.items:
-        job_data = {
-            'id': job.id,
-            'title': job.title,
-            'company_name': job.company_name,
-            'location': job.location,
-            'is_remote': job.is_remote,
-            'job_type': job.job_type,
-            'category': job.category,
-            'experience_level': job.experience_level,
-            'min_salary': job.min_salary,
-            'max_salary': job.max_salary,
-            'description': job.description[:200] + '...' if len(job.description) > 200 else job.description,
-            'is_featured': job.is_featured,
-            'created_at': job.created_at.isoformat(),
-            'skills': [skill.name for skill in job.skills]
-        }
-        jobs.append(job_data)
+    jobs = serialize_job_rows(jobs_page.items)
     
-    return jsonify({
+    result = {
         'jobs': jobs,
         'total': jobs_page.total,
         'pages': jobs_page.pages,
         'current_page': page
-    })
+    }
+    if facets is not None:
+        result['facets'] = facets
+    return jsonify(result)
 
 @app.route('/api/jobs/featured', methods=['GET'])
+@cached_response
 def get_featured_jobs():
-    featured_jobs = Job.query.filter_by(is_featured=True).order_by(Job.created_at.desc()).limit(5).all()
-    
-    jobs = []
-    for job in featured_jobs:
-        job_data = {
-            'id': job.id,
-            'title': job.title,
-            'company_name': job.company_name,
-            'location': job.location,
-            'is_remote': job.is_remote,
-            'job_type': job.job_type,
-            'min_salary': job.min_salary,
-            'max_salary': job.max_salary,
-            'description': job.description[:200] + '...' if len(job.description) > 200 else job.description,
-            'created_at': job.created_at.isoformat(),
-            'skills': [skill.name for skill in job.skills]
-        }
-        jobs.append(job_data)
+    featured_jobs = active_jobs(db.session.query(*JOB_LIST_COLUMNS)).filter(Job.is_featured == True).order_by(Job.created_at.desc()).limit(5).all()
+    
+    jobs = serialize_job_rows(featured_jobs)
     
     return jsonify({'featured_jobs': jobs})
 
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
 def get_job(job_id):
-    job = Job.query.get_or_404(job_id)
+    job = with_skills(Job.query).filter(Job.id == job_id).first_or_404()
     
-    job_data = {
-        'id': job.id,
-        'title': job.title,
-        'company_name': job.company_name,
-        'location': job.location,
-        'is_remote': job.is_remote,
-        'job_type': job.job_type,
-        'category': job.category,
-        'experience_level': job.experience_level,
-        'min_salary': job.min_salary,
-        'max_salary': job.max_salary,
-        'description': job.description,
-        'application_url': job.application_url,
-        'is_featured': job.is_featured,
-        'created_at': job.created_at.isoformat(),
-        'employer_id': job.user_id,
-        'skills': [skill.name for skill in job.skills]
-    }
+    job_data = serialize_job(job, detail=True)
     
     return jsonify({'job': job_data})
 
@@ -319,15 +1580,50 @@ def create_job():
         user_id=g.current_user.id
     )
     
+    # Otherwise listed for JOB_TTL_DAYS
+    if data.get('expires_at'):
+        try:
+            new_job.expires_at = parse_expires_at(data['expires_at'])
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+    
     # Add skills
     if skill_names:
         new_job.skills = add_or_get_skills(skill_names)
     
     db.session.add(new_job)
     db.session.commit()
+    response_cache.clear()
+    job_index.mark_stale()
     
     return jsonify({'message': 'Job posted successfully', 'job_id': new_job.id}), 201
 
+@app.route('/api/jobs/import', methods=['POST'])
+@token_required
+def import_jobs_feed():
+    if not g.current_user.is_employer:
+        return jsonify({'message': 'Only employers can post jobs'}), 403
+    
+    # NDJSON by default; CSV when asked for by content type or ?format=csv
+    feed_format = request.args.get('format')
+    if not feed_format:
+        feed_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+    if feed_format not in ('ndjson', 'csv'):
+        return jsonify({'message': 'Unsupported format'}), 400
+    
+    # Read the body as it arrives rather than buffering the whole feed
+    stream = io.TextIOWrapper(
+        get_input_stream(request.environ, max_content_length=app.config['IMPORT_MAX_CONTENT_LENGTH']),
+        encoding='utf-8', newline=''
+    )
+    rows = read_csv(stream) if feed_format == 'csv' else read_ndjson(stream)
+    
+    chunk_size = request.args.get('chunk_size', app.config['IMPORT_CHUNK_SIZE'], type=int)
+    chunk_size = min(max(chunk_size, 1), app.config['IMPORT_CHUNK_SIZE'])
+    report = import_jobs(rows, g.current_user, chunk_size)
+    
+    return jsonify(report)
+
 @app.route('/api/jobs/<int:job_id>', methods=['PUT'])
 @token_required
 def update_job(job_id):
@@ -364,17 +1660,27 @@ def update_job(job_id):
         job.max_salary = data['max_salary']
     if 'description' in data:
         job.description = data['description']
+        job.summary = job_summary(data['description'])
     if 'application_url' in data:
         job.application_url = data['application_url']
     if 'plan' in data:
         job.is_featured = data['plan'] in ['premium', 'enterprise']
+    if data.get('expires_at'):
+        try:
+            job.expires_at = parse_expires_at(data['expires_at'])
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
     
     # Process skills
     if 'skills' in data and data['skills']:
         skill_names = [s.strip() for s in data['skills'].split(',')]
         job.skills = add_or_get_skills(skill_names)
+        # A change to the skills alone doesn't update the job row
+        job.updated_at = datetime.utcnow()
     
     db.session.commit()
+    response_cache.clear()
+    job_index.mark_stale()
     
     return jsonify({'message': 'Job updated successfully'})
 
@@ -388,10 +1694,13 @@ def delete_job(job_id):
     
     db.session.delete(job)
     db.session.commit()
+    response_cache.clear()
+    job_index.mark_stale()
     
     return jsonify({'message': 'Job deleted successfully'})
 
 @app.route('/api/categories', methods=['GET'])
+@cached_response
 def get_categories():
     # You can expand this to pull from a database table if needed
     categories = [
@@ -407,10 +1716,33 @@ def get_categories():
     return jsonify({'categories': categories})
 
 @app.route('/api/skills', methods=['GET'])
+@cached_response
 def get_skills():
     skills = Skill.query.all()
     return jsonify({'skills': [skill.name for skill in skills]})
 
+@app.route('/api/recommendations', methods=['GET'])
+@token_required
+def get_recommendations():
+    if g.current_user.is_employer:
+        return jsonify({'message': 'Recommendations are only available to job seekers'}), 403
+    
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    
+    refresh_job_index()
+    applied = db.session.scalars(
+        db.select(JobApplication.job_id).where(JobApplication.user_id == g.current_user.id)
+    ).all()
+    ranked = job_index.recommend(applied, limit)
+    
+    scores = dict(ranked)
+    rows = db.session.query(*JOB_LIST_COLUMNS).filter(Job.id.in_(scores)).all()
+    recommendations = sorted(serialize_job_rows(rows), key=lambda job: -scores[job['id']])
+    for job_data in recommendations:
+        job_data['score'] = round(scores[job_data['id']], 4)
+    
+    return jsonify({'jobs': recommendations})
+
 @app.route('/api/jobs/<int:job_id>/apply', methods=['POST'])
 @token_required
 def apply_for_job(job_id):
@@ -419,6 +1751,9 @@ def apply_for_job(job_id):
     
     job = Job.query.get_or_404(job_id)
     
+    if job.expires_at and job.expires_at <= datetime.utcnow():
+        return jsonify({'message': 'This job is no longer accepting applications'}), 400
+    
     # Check if user already applied for this job
     existing_application = JobApplication.query.filter_by(
         job_id=job_id, 
@@ -428,18 +1763,15 @@ def apply_for_job(job_id):
     if existing_application:
         return jsonify({'message': 'You have already applied for this job'}), 409
     
+    resume = None
     resume_url = None
     
     # Handle file upload if present
     if 'resume' in request.files:
         resume_file = request.files['resume']
         if resume_file and resume_file.filename and allowed_file(resume_file.filename):
-            # Generate a unique filename to prevent collisions
-            filename = secure_filename(resume_file.filename)
-            unique_filename = f"{uuid.uuid4()}_{filename}"
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', unique_filename)
-            resume_file.save(file_path)
-            resume_url = f"/uploads/resumes/{unique_filename}"
+            resume = store_resume(resume_file)
+            resume_url = f"/uploads/{resume.path}"
     
     # Get cover letter from form data
     cover_letter = request.form.get('cover_letter')
@@ -455,30 +1787,65 @@ def apply_for_job(job_id):
     db.session.add(new_application)
     db.session.commit()
     
+    if resume is not None and resume.processed_at is None:
+        task_queue.enqueue('process_resume', resume.sha256)
+    task_queue.enqueue('notify_new_application', new_application.id)
+    
     return jsonify({'message': 'Application submitted successfully'}), 201
 
-@app.route('/uploads/resumes/<filename>', methods=['GET'])
+@app.route('/uploads/resumes/<path:filename>', methods=['GET'])
 @token_required
 def download_resume(filename):
-    # Check if the user is authorized to download this resume
-    # This would require looking up which application this resume belongs to
-    # and checking if the current user is either the applicant or the employer
+    # Only the applicant and the employer who owns the job may download a
+    # resume; one indexed lookup from the file to its applications
+    authorized = db.session.query(JobApplication.id).join(
+        Job, Job.id == JobApplication.job_id
+    ).filter(
+        JobApplication.resume_url == f'/uploads/resumes/{filename}',
+        (JobApplication.user_id == g.current_user.id) | (Job.user_id == g.current_user.id)
+    ).first()
+    if not authorized:
+        return jsonify({'message': 'Resume not found'}), 404
     
-    # For simplicity, we'll just check if they're authenticated
-    return send_from_directory(os.path.join(app.config['UPLOAD_FOLDER'], 'resumes'), filename)
+    directory = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
+    
+    if app.config['RESUME_SENDFILE'] == 'x-accel-redirect':
+        path = safe_join(directory, filename)
+        if path is None or not os.path.isfile(path):
+            return jsonify({'message': 'Resume not found'}), 404
+        stat = os.stat(path)
+        
+        # nginx sends the body and handles Range; revalidation is answered here
+        response = app.response_class(
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        response.headers['X-Accel-Redirect'] = app.config['RESUME_ACCEL_PREFIX'] + filename
+        response.set_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+        response.last_modified = stat.st_mtime
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+    
+    # send_file handles ETag, Last-Modified and Range, and emits X-Sendfile
+    # when USE_X_SENDFILE is on
+    response = send_from_directory(directory, filename, conditional=True, etag=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/applications', methods=['GET'])
 @token_required
 def get_applications():
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
     
+    query = application_rows()
     if g.current_user.is_employer:
         # Get applications for jobs posted by this employer
-        query = JobApplication.query.join(Job).filter(Job.user_id == g.current_user.id)
+        query = query.filter(Job.user_id == g.current_user.id)
     else:
         # Get applications submitted by this user
-        query = JobApplication.query.filter_by(user_id=g.current_user.id)
+        query = query.filter(JobApplication.user_id == g.current_user.id)
     
     # Filter by status if provided
     status = request.args.get('status')
@@ -488,26 +1855,26 @@ def get_applications():
     # Sort by most recent
     query = query.order_by(JobApplication.created_at.desc())
     
-    # Paginate results
-    applications_page = query.paginate(page=page, per_page=per_page, error_out=False)
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = keyset_paginate(query, JobApplication, request.args['cursor'], per_page)
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), 400
+    else:
+        # Paginate results
+        applications_page = query.paginate(page=page, per_page=per_page, error_out=False)
+        items = applications_page.items
     
-    applications = []
-    for application in applications_page.items:
-        job = Job.query.get(application.job_id)
-        user = User.query.get(application.user_id)
-        
-        application_data = {
-            'id': application.id,
-            'job_id': application.job_id,
-            'job_title': job.title,
-            'company_name': job.company_name,
-            'user_id': application.user_id,
-            'user_email': user.email,
-            'resume_url': application.resume_url,
-            'status': application.status,
-            'created_at': application.created_at.isoformat()
+    applications = [serialize_application(row) for row in items]
+    
+    if 'cursor' in request.args:
+        result = {
+            'applications': applications,
+            'next_cursor': next_cursor
         }
-        applications.append(application_data)
+        if request.args.get('include_total') == 'true':
+            result['total'] = query.order_by(None).count()
+        return jsonify(result)
     
     return jsonify({
         'applications': applications,
@@ -516,33 +1883,72 @@ def get_applications():
         'current_page': page
     })
 
+@app.route('/api/applications/export', methods=['GET'])
+@token_required
+def export_applications():
+    if not g.current_user.is_employer:
+        return jsonify({'message': 'Only employers can export applications'}), 403
+    
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'message': 'Unsupported format'}), 400
+    
+    query = application_rows(JobApplication.cover_letter).filter(Job.user_id == g.current_user.id)
+    
+    job_id = request.args.get('job_id', type=int)
+    if job_id:
+        query = query.filter(JobApplication.job_id == job_id)
+    status = request.args.get('status')
+    if status:
+        query = query.filter(JobApplication.status == status)
+    
+    # Stream rows from a server-side cursor in fixed-size batches, so memory
+    # stays flat however many applications there are
+    rows = query.order_by(JobApplication.created_at, JobApplication.id).execution_options(
+        yield_per=app.config['EXPORT_BATCH_SIZE']
+    )
+    
+    def generate_ndjson():
+        for row in rows:
+            yield app.json.dumps(serialize_application(row, detail=True)) + '\n'
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=[
+            'id', 'job_id', 'job_title', 'company_name', 'user_id', 'user_email',
+            'resume_url', 'status', 'created_at', 'cover_letter'
+        ])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(serialize_application(row, detail=True))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    
+    if export_format == 'csv':
+        response = app.response_class(stream_with_context(generate_csv()), mimetype='text/csv')
+    else:
+        response = app.response_class(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename=applications.{export_format}'
+    return response
+
 @app.route('/api/applications/<int:application_id>', methods=['GET'])
 @token_required
 def get_application(application_id):
-    application = JobApplication.query.get_or_404(application_id)
-    job = Job.query.get(application.job_id)
+    application = application_rows(
+        JobApplication.cover_letter,
+        Job.user_id.label('employer_id')
+    ).filter(JobApplication.id == application_id).first_or_404()
     
     # Check if user is authorized to view this application
     if not g.current_user.is_employer and application.user_id != g.current_user.id:
         return jsonify({'message': 'Unauthorized to view this application'}), 403
     
-    if g.current_user.is_employer and job.user_id != g.current_user.id:
+    if g.current_user.is_employer and application.employer_id != g.current_user.id:
         return jsonify({'message': 'Unauthorized to view this application'}), 403
     
-    user = User.query.get(application.user_id)
-    
-    application_data = {
-        'id': application.id,
-        'job_id': application.job_id,
-        'job_title': job.title,
-        'company_name': job.company_name,
-        'user_id': application.user_id,
-        'user_email': user.email,
-        'resume_url': application.resume_url,
-        'cover_letter': application.cover_letter,
-        'status': application.status,
-        'created_at': application.created_at.isoformat()
-    }
+    application_data = serialize_application(application, detail=True)
     
     return jsonify({'application': application_data})
 
@@ -552,22 +1958,25 @@ def update_application_status(application_id):
     if not g.current_user.is_employer:
         return jsonify({'message': 'Only employers can update application status'}), 403
     
-    application = JobApplication.query.get_or_404(application_id)
-    job = Job.query.get(application.job_id)
+    application, employer_id = db.session.query(JobApplication, Job.user_id).join(
+        Job, Job.id == JobApplication.job_id
+    ).filter(JobApplication.id == application_id).first_or_404()
     
     # Check if this employer owns the job
-    if job.user_id != g.current_user.id:
+    if employer_id != g.current_user.id:
         return jsonify({'message': 'You can only update applications for your own jobs'}), 403
     
     data = request.get_json()
     status = data.get('status')
     
-    if status not in ['pending', 'reviewed', 'shortlisted', 'rejected']:
+    if status not in APPLICATION_STATUSES:
         return jsonify({'message': 'Invalid status'}), 400
     
     application.status = status
     db.session.commit()
     
+    task_queue.enqueue('notify_application_status', application.id, status)
+    
     return jsonify({'message': 'Application status updated successfully'})
 
 @app.route('/api/dashboard/stats', methods=['GET'])
@@ -575,47 +1984,96 @@ def update_application_status(application_id):
 def get_dashboard_stats():
     if g.current_user.is_employer:
         # Stats for employers
-        active_jobs_count = Job.query.filter_by(user_id=g.current_user.id).count()
-        new_applications_count = JobApplication.query.join(Job).filter(
-            Job.user_id == g.current_user.id,
-            JobApplication.status == 'pending'
-        ).count()
+        active_jobs_count = active_jobs(Job.query.filter_by(user_id=g.current_user.id)).count()
         
-        # Get application count by status
-        application_stats = {}
-        for status in ['pending', 'reviewed', 'shortlisted', 'rejected']:
-            count = JobApplication.query.join(Job).filter(
-                Job.user_id == g.current_user.id,
-                JobApplication.status == status
-            ).count()
-            application_stats[status] = count
+        # Application count by status, in one grouped pass
+        application_stats = application_status_counts(
+            db.select(JobApplication.status, db.func.count(JobApplication.id))
+            .join(Job, Job.id == JobApplication.job_id)
+            .where(Job.user_id == g.current_user.id)
+        )
         
         return jsonify({
             'active_jobs': active_jobs_count,
-            'new_applications': new_applications_count,
+            'new_applications': application_stats['pending'],
             'application_stats': application_stats
         })
     else:
         # Stats for job seekers
-        applications_count = JobApplication.query.filter_by(user_id=g.current_user.id).count()
-        
-        # Application status breakdown
-        application_stats = {}
-        for status in ['pending', 'reviewed', 'shortlisted', 'rejected']:
-            count = JobApplication.query.filter_by(
-                user_id=g.current_user.id,
-                status=status
-            ).count()
-            application_stats[status] = count
+        application_stats = application_status_counts(
+            db.select(JobApplication.status, db.func.count(JobApplication.id))
+            .where(JobApplication.user_id == g.current_user.id)
+        )
         
         return jsonify({
-            'applications_count': applications_count,
+            'applications_count': sum(application_stats.values()),
             'application_stats': application_stats
         })
 
 # Initialize the database
 with app.app_context():
+    if app.config['AUTO_MIGRATE']:
+        db.create_all()
+        run_migrations()
+    init_search_index()
+
+@app.cli.command('migrate')
+def migrate_command():
     db.create_all()
+    run_migrations()
+    init_search_index()
+    click.echo('Database is up to date')
+
+@app.cli.command('import-jobs')
+@click.argument('feed', type=click.File('r', encoding='utf-8'))
+@click.option('--employer', 'email', required=True, help='Email of the employer the jobs are posted as.')
+@click.option('--format', 'feed_format', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='Feed format, guessed from the file extension by default.')
+@click.option('--chunk-size', type=int, default=None, help='Rows per transaction.')
+def import_jobs_command(feed, email, feed_format, chunk_size):
+    employer = User.query.filter_by(email=email, is_employer=True).first()
+    if not employer:
+        raise click.ClickException(f'No employer with email {email}')
+    
+    if not feed_format:
+        feed_format = 'csv' if feed.name.endswith('.csv') else 'ndjson'
+    rows = read_csv(feed) if feed_format == 'csv' else read_ndjson(feed)
+    
+    report = import_jobs(rows, employer, chunk_size)
+    
+    for error in report['errors']:
+        click.echo(f"Row {error['row']}: {error['error']}", err=True)
+    click.echo(f"Created {report['created']}, updated {report['updated']}, "
+               f"skipped {report['skipped']}, failed {report['failed']}")
+
+@app.cli.command('worker')
+@click.option('--threads', type=int, default=2, help='Number of worker threads.')
+def worker_command(threads):
+    if app.config['TASK_QUEUE_TYPE'] != 'sqlite':
+        raise click.ClickException('Separate workers need TASK_QUEUE_TYPE=sqlite')
+    task_queue.start(threads)
+    click.echo(f'Running {threads} task worker threads on {app.config["TASK_QUEUE_PATH"]}')
+    next_archive = time.time()
+    try:
+        while True:
+            if app.config['ARCHIVE_INTERVAL'] and time.time() >= next_archive:
+                # Every worker process schedules it; only one run is pending at a time
+                task_queue.enqueue('archive_expired_jobs', unique=True)
+                next_archive = time.time() + app.config['ARCHIVE_INTERVAL']
+            time.sleep(60)
+            app.logger.info('Task queue: %s', task_queue.metrics())
+    except KeyboardInterrupt:
+        task_queue.stop()
+
+@app.cli.command('archive-jobs')
+@click.option('--batch-size', type=int, default=None, help='Jobs moved per transaction.')
+def archive_jobs_command(batch_size):
+    archived = archive_expired_jobs(batch_size)
+    click.echo(f"Archived {archived['jobs']} jobs and {archived['applications']} applications")
+
+@app.cli.command('task-stats')
+def task_stats_command():
+    click.echo(json.dumps(task_queue.metrics(), indent=2))
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,16 @@
+import os
+
+# Benchmarks run against their own database and upload folder, measure the
+# uncached code paths, and keep background tasks out of the timings. These
+# must be set before app is imported.
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(BENCH_DIR, 'data', 'bench.db')
+
+
+def configure(db_path=DEFAULT_DB):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    os.environ['DATABASE_URI'] = f'sqlite:///{os.path.abspath(db_path)}'
+    os.environ['UPLOAD_FOLDER'] = os.path.join(BENCH_DIR, 'data', 'uploads')
+    os.environ.setdefault('CACHE_TYPE', 'null')
+    os.environ.setdefault('TASK_WORKERS', '0')
+    os.environ.setdefault('SLOW_QUERY_MS', '1000000')
@@ -0,0 +1,198 @@
+"""Benchmark the API against a seeded database through the Flask test client.
+
+    python -m bench.seed --jobs 100000
+    python -m bench.run --iterations 200
+    python -m bench.run --compare bench/results/<before>.json bench/results/<after>.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bench import BENCH_DIR, DEFAULT_DB, configure
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+JOB_QUERIES = {
+    'get_jobs': '',
+    'get_jobs:keyword': 'keyword=python',
+    'get_jobs:keyword_relevance': 'keyword=python&sort=relevance',
+    'get_jobs:remote': 'location=remote',
+    'get_jobs:location': 'location=nairobi',
+    'get_jobs:category': 'category=DevOps',
+    'get_jobs:job_type': 'job_type=Contract&job_type=Internship',
+    'get_jobs:experience': 'experience=Senior',
+    'get_jobs:skills_all': 'skills=skill1&skills=skill2',
+    'get_jobs:skills_any': 'skills=skill1&skills=skill2&skills_match=any',
+    'get_jobs:combined': 'keyword=engineer&category=Backend Development&experience=Mid&skills=skill3',
+    'get_jobs:deep_page': 'page=200',
+    'get_jobs:cursor': 'cursor=',
+    'get_jobs:featured': None,
+}
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                       text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    configure(args.db)
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    import jwt
+    from app import app, db, User, Job
+
+    query_count = [0]
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count_query(*_):
+        query_count[0] += 1
+
+    client = app.test_client()
+
+    with app.app_context():
+        employer = db.session.scalar(
+            db.select(User.id).join(Job, Job.user_id == User.id)
+            .group_by(User.id).order_by(db.func.count(Job.id).desc()).limit(1)
+        )
+        seeker = db.session.scalar(db.select(User.id).where(User.is_employer == False).limit(1))
+        if employer is None or seeker is None:
+            sys.exit(f'{args.db} has no data, run python -m bench.seed first')
+
+    def auth(user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.utcnow() + timedelta(hours=1)},
+                           app.config['SECRET_KEY'])
+        return {'Authorization': f'Bearer {token}'}
+
+    employer_headers, seeker_headers = auth(employer), auth(seeker)
+
+    cases = {}
+    for name, query in JOB_QUERIES.items():
+        url = '/api/jobs/featured' if query is None else f'/api/jobs?{query}'
+        cases[name] = ('get', url, {})
+    cases['get_applications:employer'] = ('get', '/api/applications', {'headers': employer_headers})
+    cases['get_applications:employer_status'] = (
+        'get', '/api/applications?status=pending', {'headers': employer_headers})
+    cases['get_applications:employer_cursor'] = (
+        'get', '/api/applications?cursor=', {'headers': employer_headers})
+    cases['get_applications:seeker'] = ('get', '/api/applications', {'headers': seeker_headers})
+    cases['get_dashboard_stats:employer'] = ('get', '/api/dashboard/stats', {'headers': employer_headers})
+    cases['get_dashboard_stats:seeker'] = ('get', '/api/dashboard/stats', {'headers': seeker_headers})
+    cases['create_job'] = ('post', '/api/jobs', {'headers': employer_headers, 'json': {
+        'job_title': 'Benchmark Engineer', 'location': 'Remote', 'job_type': 'Full-time',
+        'category': 'DevOps', 'experience': 'Mid', 'description': 'Benchmark posting. ' * 20,
+        'skills': 'skill1, skill2, benchmarking'
+    }})
+
+    if args.only:
+        cases = {name: case for name, case in cases.items() if any(name.startswith(o) for o in args.only)}
+
+    results = {}
+    created_jobs = []
+    for name, (method, url, kwargs) in cases.items():
+        for _ in range(args.warmup):
+            response = getattr(client, method)(url, **kwargs)
+            if method == 'post':
+                created_jobs.append(response.get_json()['job_id'])
+
+        timings, queries = [], []
+        for _ in range(args.iterations):
+            query_count[0] = 0
+            started = time.perf_counter()
+            response = getattr(client, method)(url, **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(query_count[0])
+            if response.status_code >= 400:
+                sys.exit(f'{name}: {method.upper()} {url} returned {response.status_code}')
+            if method == 'post':
+                created_jobs.append(response.get_json()['job_id'])
+
+        results[name] = {
+            'url': url,
+            'iterations': args.iterations,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries_per_request': round(statistics.fmean(queries), 2),
+        }
+        print(f"{name:40} p50 {results[name]['p50_ms']:9.2f} ms  p95 {results[name]['p95_ms']:9.2f} ms  "
+              f"p99 {results[name]['p99_ms']:9.2f} ms  {results[name]['queries_per_request']:6.2f} queries")
+
+    # Leave the dataset as it was for the next run
+    if created_jobs:
+        for job_id in created_jobs:
+            client.delete(f'/api/jobs/{job_id}', headers=employer_headers)
+
+    with app.app_context():
+        scale = {
+            'jobs': db.session.scalar(db.select(db.func.count(Job.id))),
+            'users': db.session.scalar(db.select(db.func.count(User.id))),
+        }
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': sys.version.split()[0],
+        'database': os.path.basename(args.db),
+        'scale': scale,
+        'results': results,
+    }
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{'benchmark':40} {'p50 before':>11} {'p50 after':>11} {'change':>8} {'queries':>14}")
+    for name, result in after['results'].items():
+        old = before['results'].get(name)
+        if old is None:
+            print(f"{name:40} {'-':>11} {result['p50_ms']:11.2f}")
+            continue
+        change = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0
+        queries = f"{old['queries_per_request']:g} -> {result['queries_per_request']:g}"
+        print(f"{name:40} {old['p50_ms']:11.2f} {result['p50_ms']:11.2f} {change:+7.1f}% {queries:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=DEFAULT_DB, help='Seeded SQLite file.')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--only', nargs='*', help='Run only benchmarks whose name starts with these.')
+    parser.add_argument('--output', help='Where to write the JSON results.')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files.')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{report['commit'] or 'unknown'}-{datetime.utcnow():%Y%m%d%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
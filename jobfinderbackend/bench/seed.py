@@ -0,0 +1,135 @@
+"""Seed a benchmark database with synthetic users, jobs, skills and applications.
+
+    python -m bench.seed --jobs 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bench import DEFAULT_DB, configure
+
+CATEGORIES = [
+    'Frontend Development', 'Backend Development', 'Full Stack Development', 'Mobile Development',
+    'DevOps', 'Data Science / Analytics', 'UI/UX Design', 'Other'
+]
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship']
+EXPERIENCE_LEVELS = ['Entry', 'Mid', 'Senior']
+LOCATIONS = ['Remote', 'Nairobi', 'Mombasa', 'Kisumu', 'Lagos', 'Berlin', 'London', 'New York']
+TITLE_WORDS = ['Senior', 'Junior', 'Lead', 'Staff', 'Principal']
+ROLES = ['Python Developer', 'React Engineer', 'DevOps Engineer', 'Data Scientist', 'Product Designer',
+         'Android Developer', 'Backend Engineer', 'QA Analyst', 'Site Reliability Engineer', 'Go Developer']
+WORDS = ('build maintain scalable services team product customers data pipelines cloud api design '
+         'testing deploy monitor collaborate mentor review architecture performance security').split()
+
+
+def chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def seed(args):
+    configure(args.db)
+    from app import app, db, User, Job, Skill, JobApplication, job_skills
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    password = generate_password_hash('password')
+
+    with app.app_context():
+        started = time.perf_counter()
+
+        employers = max(1, args.users // 10)
+        db.session.execute(db.insert(User), [
+            {'email': f'employer{i}@example.com', 'password': password, 'is_employer': True,
+             'company_name': f'Company {i}', 'created_at': now}
+            for i in range(employers)
+        ] + [
+            {'email': f'seeker{i}@example.com', 'password': password, 'is_employer': False,
+             'created_at': now}
+            for i in range(args.users - employers)
+        ])
+        user_ids = db.session.scalars(db.select(User.id).order_by(User.id)).all()
+        employer_ids, seeker_ids = user_ids[:employers], user_ids[employers:]
+        company_names = {user_id: f'Company {i}' for i, user_id in enumerate(employer_ids)}
+
+        db.session.execute(db.insert(Skill), [{'name': f'skill{i}'} for i in range(args.skills)])
+        skill_ids = db.session.scalars(db.select(Skill.id)).all()
+        db.session.commit()
+
+        first_job_id = (db.session.scalar(db.select(db.func.max(Job.id))) or 0) + 1
+        for batch_start in range(0, args.jobs, args.batch_size):
+            batch = range(batch_start, min(batch_start + args.batch_size, args.jobs))
+            jobs, links = [], []
+            for i in batch:
+                employer_id = rng.choice(employer_ids)
+                location = rng.choice(LOCATIONS)
+                min_salary = rng.randrange(20000, 150000, 1000)
+                jobs.append({
+                    'id': first_job_id + i,
+                    'title': f'{rng.choice(TITLE_WORDS)} {rng.choice(ROLES)}',
+                    'company_name': company_names[employer_id],
+                    'location': location,
+                    'is_remote': location == 'Remote',
+                    'job_type': rng.choice(JOB_TYPES),
+                    'category': rng.choice(CATEGORIES),
+                    'experience_level': rng.choice(EXPERIENCE_LEVELS),
+                    'min_salary': min_salary,
+                    'max_salary': min_salary + rng.randrange(0, 50000, 1000),
+                    'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))),
+                    'is_featured': rng.random() < 0.05,
+                    'created_at': now - timedelta(minutes=args.jobs - i),
+                    'user_id': employer_id
+                })
+                for skill_id in rng.sample(skill_ids, min(len(skill_ids), rng.randint(1, 6))):
+                    links.append({'job_id': first_job_id + i, 'skill_id': skill_id})
+            db.session.execute(db.insert(Job), jobs)
+            db.session.execute(job_skills.insert(), links)
+            db.session.commit()
+            print(f'  jobs {batch.stop}/{args.jobs}', file=sys.stderr)
+
+        job_ids = range(first_job_id, first_job_id + args.jobs)
+        applications = set()
+        while len(applications) < min(args.applications, len(job_ids) * len(seeker_ids)):
+            applications.add((rng.choice(job_ids), rng.choice(seeker_ids)))
+        statuses = ['pending', 'reviewed', 'shortlisted', 'rejected']
+        for batch in chunks(sorted(applications), args.batch_size):
+            db.session.execute(db.insert(JobApplication), [
+                {'job_id': job_id, 'user_id': user_id, 'status': rng.choice(statuses),
+                 'cover_letter': 'I am interested in this role.',
+                 'created_at': now - timedelta(seconds=rng.randrange(0, 86400 * 30))}
+                for job_id, user_id in batch
+            ])
+            db.session.commit()
+
+        print(f'Seeded {args.users} users, {args.skills} skills, {args.jobs} jobs and '
+              f'{len(applications)} applications into {args.db} '
+              f'in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite file to create.')
+    parser.add_argument('--jobs', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=1000, help='One in ten users is an employer.')
+    parser.add_argument('--skills', type=int, default=200)
+    parser.add_argument('--applications', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42, help='Random seed, for reproducible data.')
+    parser.add_argument('--reset', action='store_true', help='Delete an existing database first.')
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        if not args.reset:
+            parser.error(f'{args.db} exists, pass --reset to replace it')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.db + suffix):
+                os.remove(args.db + suffix)
+    seed(args)
+
+
+if __name__ == '__main__':
+    main()
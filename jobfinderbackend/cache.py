@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MemoryBackend:
+    """Per-process response store."""
+
+    def __init__(self, maxsize=512, ttl=60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._cache.set(key, value, ttl)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class RedisBackend:
+    """Response store shared by all workers, on any client with the redis-py
+    ``get``/``set``/``incr`` interface. Values are stored as bytes.
+
+    Keys are namespaced by a generation counter, so ``clear`` is a single
+    INCR rather than a scan; stale generations simply expire.
+    """
+
+    def __init__(self, client, prefix='jobboard:cache', ttl=60):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key):
+        generation = self.client.get(f'{self.prefix}:generation') or b'0'
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        return f'{self.prefix}:{generation}:{key}'
+
+    def get(self, key):
+        return self.client.get(self._key(key))
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self._key(key), value, ex=self.ttl if ttl is None else ttl)
+
+    def clear(self):
+        self.client.incr(f'{self.prefix}:generation')
+
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def clear(self):
+        pass
+
+
+def create_backend(cache_type, maxsize=512, ttl=60, redis_url=None):
+    if cache_type == 'redis':
+        import redis
+        return RedisBackend(redis.Redis.from_url(redis_url), ttl=ttl)
+    if cache_type == 'null':
+        return NullBackend()
+    return MemoryBackend(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,29 @@
+import multiprocessing
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# Import the app once in the master, then fork the workers
+preload_app = True
+
+
+def post_fork(server, worker):
+    from app import app, db, task_queue
+
+    # Don't reuse database connections opened by the master
+    with app.app_context():
+        db.engine.dispose(close=False)
+    # The master never starts task threads; each worker runs its own pool
+    task_queue.after_fork(app.config['TASK_WORKERS'])
+
+
+def when_ready(server):
+    from app import app, refresh_job_index
+
+    # Build the recommendation index before forking, so workers start warm
+    with app.app_context():
+        refresh_job_index()
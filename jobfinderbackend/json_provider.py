@@ -0,0 +1,47 @@
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # falls back to the standard library
+    orjson = None
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider, except dates are written in ISO 8601 like orjson
+    writes them, so handlers can pass datetimes through either provider."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """Serializes with orjson, which encodes dicts, lists and datetimes in C
+    and returns bytes that go straight into the response body. Keys are not
+    sorted."""
+
+    option = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option), mimetype=self.mimetype
+        )
+
+
+def create_provider(provider_type, app):
+    if provider_type == 'orjson':
+        if orjson is not None:
+            return OrjsonProvider(app)
+        app.logger.warning('JSON_PROVIDER is orjson but orjson is not installed, using the standard library')
+    return StdlibJSONProvider(app)
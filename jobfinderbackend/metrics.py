@@ -0,0 +1,114 @@
+import bisect
+import os
+import threading
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _labels(names, values):
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    def __init__(self, name, help, label_names, buckets):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0, 0.0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += 1
+        series[2] += value
+
+    def render(self, const_names=(), const_values=()):
+        names = const_names + self.label_names
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for labels, (counts, count, total) in sorted(self._series.items()):
+            labels = const_values + labels
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_labels(names + ("le",), labels + (bound,))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_labels(names + ("le",), labels + ("+Inf",))} {count}')
+            lines.append(f'{self.name}_count{_labels(names, labels)} {count}')
+            lines.append(f'{self.name}_sum{_labels(names, labels)} {total}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, label_names):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values = defaultdict(float)
+
+    def inc(self, labels, amount=1):
+        self._values[labels] += amount
+
+    def render(self, const_names=(), const_values=()):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{_labels(const_names + self.label_names, const_values + labels)} {value}')
+        return lines
+
+
+class RequestMetrics:
+    """Per-endpoint request latency and database usage for this process,
+    rendered in the Prometheus text exposition format.
+
+    Every series carries a ``pid`` label, since each worker process keeps
+    its own counts and a scrape reaches whichever worker accepts it. Sum
+    over ``pid`` to get totals for the server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter(
+            'http_requests_total', 'Requests handled.', ('endpoint', 'method', 'status'))
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Request latency.', ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.queries = Histogram(
+            'http_request_db_queries', 'SQL statements issued per request.', ('endpoint', 'method'),
+            QUERY_COUNT_BUCKETS)
+        self.db_time = Counter(
+            'http_request_db_seconds_total', 'Time spent in SQL statements.', ('endpoint', 'method'))
+        self.slow_queries = Counter(
+            'db_slow_queries_total', 'SQL statements slower than the slow query threshold.', ('endpoint',))
+
+    def observe_request(self, endpoint, method, status, seconds, query_count, db_seconds):
+        with self._lock:
+            self.requests.inc((endpoint, method, status))
+            self.latency.observe((endpoint, method), seconds)
+            self.queries.observe((endpoint, method), query_count)
+            self.db_time.inc((endpoint, method), db_seconds)
+
+    def observe_slow_query(self, endpoint):
+        with self._lock:
+            self.slow_queries.inc((endpoint,))
+
+    def render(self, counters=None, gauges=None):
+        # counters and gauges: {name: (help, value)} collected elsewhere in
+        # this process
+        const_names, const_values = ('pid',), (os.getpid(),)
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.latency, self.queries, self.db_time, self.slow_queries):
+                lines.extend(metric.render(const_names, const_values))
+        for kind, values in (('counter', counters), ('gauge', gauges)):
+            for name, (help, value) in (values or {}).items():
+                lines.extend([f'# HELP {name} {help}', f'# TYPE {name} {kind}',
+                              f'{name}{_labels(const_names, const_values)} {value}'])
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from cache import TTLCache
+
+
+class MemoryBackend:
+    """Token buckets for this process only, so with several workers each one
+    allows the full rate. Idle buckets are evicted once they would be full
+    again anyway."""
+
+    def __init__(self, maxsize=100000):
+        self._buckets = TTLCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def hit(self, key, capacity, rate, ttl):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets.set(key, (tokens, now), ttl)
+        return allowed, tokens
+
+
+class RedisBackend:
+    """Token buckets shared by all workers. Each hit is one atomic script
+    call that refills, takes a token and saves the bucket."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, client, prefix='jobboard:ratelimit'):
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    def hit(self, key, capacity, rate, ttl):
+        allowed, tokens = self._script(keys=[f'{self.prefix}:{key}'], args=[capacity, rate, int(ttl) + 1])
+        return bool(allowed), float(tokens)
+
+
+class NullBackend:
+    def hit(self, key, capacity, rate, ttl):
+        return True, capacity
+
+
+class RateLimiter:
+    """Token bucket per key. A limit of ``count`` per ``window`` seconds is a
+    bucket of ``count`` tokens refilled at ``count / window`` per second, so
+    bursts of up to ``count`` are allowed, and no more than about that many
+    over any sliding window after that."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def hit(self, key, count, window):
+        """Takes a token for ``key``. Returns whether that was allowed and,
+        if not, how many seconds until the next token."""
+        rate = count / window
+        allowed, tokens = self.backend.hit(key, count, rate, window)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+
+def parse_limit(value):
+    # '10/60' is 10 requests per 60 seconds
+    count, window = value.split('/')
+    return int(count), float(window)
+
+
+def create_limiter(limiter_type, redis_url=None):
+    if limiter_type == 'redis':
+        import redis
+        return RateLimiter(RedisBackend(redis.Redis.from_url(redis_url)))
+    if limiter_type == 'null':
+        return RateLimiter(NullBackend())
+    return RateLimiter(MemoryBackend())
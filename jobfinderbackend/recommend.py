@@ -0,0 +1,147 @@
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+
+class JobIndex:
+    """Ranking features for every job, held in memory for recommendations.
+
+    Each job is a row: an L2-normalized sparse vector over skill ids plus its
+    category, experience level, creation and expiry time. A user's profile is built
+    from the rows of the jobs they applied to, and every job is scored
+    against it with one sparse matrix-vector product and a few array lookups.
+
+    ``upsert`` and ``retain`` are cheap: changed jobs are queued and merged
+    into the matrix on the next ``recommend``. ``watermark`` and
+    ``refreshed_at`` are left to the caller to track what has been loaded.
+    """
+
+    def __init__(self, half_life_days=14.0, skill_weight=0.6, category_weight=0.15,
+                 experience_weight=0.1, recency_weight=0.15):
+        self.half_life = half_life_days * 86400
+        self.weights = (skill_weight, category_weight, experience_weight, recency_weight)
+        self.watermark = None
+        self.refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._codes = ({}, {})  # category and experience level -> small int
+        self._rows = {}  # job id -> row
+        self._pending = {}  # job id -> (category, experience, created, expires, skill ids)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._active = np.zeros(0, dtype=bool)
+        self._category = np.zeros(0, dtype=np.int32)
+        self._experience = np.zeros(0, dtype=np.int32)
+        self._created = np.zeros(0, dtype=np.float64)
+        self._expires = np.zeros(0, dtype=np.float64)
+        self._skills = sparse.csr_matrix((0, 0), dtype=np.float32)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._rows) + sum(1 for job_id in self._pending if job_id not in self._rows)
+
+    def mark_stale(self):
+        self.refreshed_at = 0.0
+
+    def upsert(self, jobs, links):
+        # jobs: (id, category, experience_level, created_at and expires_at
+        # timestamps, expires_at None for never); links: (job_id, skill_id)
+        # for those jobs
+        skills = {}
+        for job_id, skill_id in links:
+            skills.setdefault(job_id, []).append(skill_id)
+        with self._lock:
+            for job_id, category, experience, created, expires in jobs:
+                self._pending[job_id] = (self._code(0, category), self._code(1, experience), created,
+                                         np.inf if expires is None else expires, skills.get(job_id, []))
+
+    def retain(self, job_ids):
+        # Drops every job not in job_ids
+        job_ids = set(job_ids)
+        with self._lock:
+            for job_id in [job_id for job_id in self._rows if job_id not in job_ids]:
+                self._active[self._rows.pop(job_id)] = False
+            for job_id in [job_id for job_id in self._pending if job_id not in job_ids]:
+                del self._pending[job_id]
+
+    def recommend(self, applied_job_ids, limit=10, now=None):
+        """Returns up to ``limit`` (job_id, score) pairs, best first, leaving
+        out expired jobs and the applied jobs themselves."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._merge_pending()
+            applied = [self._rows[job_id] for job_id in applied_job_ids if job_id in self._rows]
+
+            skill_weight, category_weight, experience_weight, recency_weight = self.weights
+            age = np.maximum(now - self._created, 0)
+            scores = recency_weight * np.exp2(-age / self.half_life)
+
+            if applied:
+                profile = np.asarray(self._skills[applied].sum(axis=0)).ravel()
+                norm = np.linalg.norm(profile)
+                if norm:
+                    scores += skill_weight * (self._skills @ (profile / norm))
+                for weight, codes in ((category_weight, self._category), (experience_weight, self._experience)):
+                    preference = np.bincount(codes[applied], minlength=codes.max() + 1) / len(applied)
+                    scores += weight * preference[codes]
+
+            scores[~self._active | (self._expires <= now)] = -np.inf
+            scores[applied] = -np.inf
+            candidates = min(limit, len(self._rows))
+            if candidates <= 0:
+                return []
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [(int(self._ids[row]), float(scores[row])) for row in top if scores[row] > -np.inf]
+
+    def _code(self, field, value):
+        return self._codes[field].setdefault(value, len(self._codes[field]))
+
+    def _merge_pending(self):
+        if not self._pending:
+            return
+
+        for job_id in self._pending:
+            if job_id in self._rows:
+                self._active[self._rows.pop(job_id)] = False
+
+        job_ids = list(self._pending)
+        values = [self._pending[job_id] for job_id in job_ids]
+        self._pending = {}
+
+        indptr = np.zeros(len(values) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(set(skill_ids)) for *_, skill_ids in values])
+        indices = np.fromiter((skill_id for *_, skill_ids in values for skill_id in sorted(set(skill_ids))),
+                              dtype=np.int64, count=indptr[-1])
+        lengths = np.diff(indptr)
+        data = np.repeat(1 / np.sqrt(np.maximum(lengths, 1)), lengths).astype(np.float32)
+        columns = max(self._skills.shape[1], int(indices.max()) + 1 if len(indices) else 0)
+        added = sparse.csr_matrix((data, indices, indptr), shape=(len(values), columns))
+
+        skills = self._skills
+        skills.resize((skills.shape[0], columns))
+        first_row = len(self._ids)
+        self._skills = sparse.vstack([skills, added], format='csr')
+        self._ids = np.concatenate([self._ids, np.array(job_ids, dtype=np.int64)])
+        self._active = np.concatenate([self._active, np.ones(len(values), dtype=bool)])
+        self._category = np.concatenate([self._category, np.array([v[0] for v in values], dtype=np.int32)])
+        self._experience = np.concatenate([self._experience, np.array([v[1] for v in values], dtype=np.int32)])
+        self._created = np.concatenate([self._created, np.array([v[2] for v in values], dtype=np.float64)])
+        self._expires = np.concatenate([self._expires, np.array([v[3] for v in values], dtype=np.float64)])
+        for offset, job_id in enumerate(job_ids):
+            self._rows[job_id] = first_row + offset
+
+        # Rows of updated and deleted jobs stay behind until they are the majority
+        if len(self._rows) * 2 < len(self._ids):
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._active)
+        self._skills = self._skills[keep]
+        self._ids = self._ids[keep]
+        self._active = self._active[keep]
+        self._category = self._category[keep]
+        self._experience = self._experience[keep]
+        self._created = self._created[keep]
+        self._expires = self._expires[keep]
+        self._rows = {int(job_id): row for row, job_id in enumerate(self._ids)}
@@ -0,0 +1,285 @@
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """In-process queue. Tasks are lost if the process exits."""
+
+    def __init__(self):
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Condition()
+
+    def push(self, name, args, run_at, attempts=0, enqueued_at=None, unique=False):
+        with self._lock:
+            if unique and any(task[2] == name and task[3] == args for task in self._heap):
+                return None
+            task_id = next(self._ids)
+            heapq.heappush(self._heap, (run_at, task_id, name, args, attempts, enqueued_at or time.time()))
+            self._lock.notify()
+            return task_id
+
+    def pop(self, timeout):
+        deadline = time.time() + timeout
+        with self._lock:
+            while True:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    run_at, task_id, name, args, attempts, enqueued_at = heapq.heappop(self._heap)
+                    return {'id': task_id, 'name': name, 'args': args,
+                            'attempts': attempts, 'enqueued_at': enqueued_at}
+                if now >= deadline:
+                    return None
+                wait = deadline - now
+                if self._heap:
+                    wait = min(wait, self._heap[0][0] - now)
+                self._lock.wait(wait)
+
+    def after_fork(self):
+        # The parent's lock may have been held by one of its threads
+        self._lock = threading.Condition()
+
+    def complete(self, task):
+        pass
+
+    def retry(self, task, run_at, error):
+        self.push(task['name'], task['args'], run_at, task['attempts'] + 1, task['enqueued_at'])
+
+    def fail(self, task, error):
+        pass
+
+    def depth(self):
+        with self._lock:
+            return len(self._heap)
+
+
+class SQLiteBackend:
+    """Durable queue in a SQLite file, shared by every process that opens it.
+
+    Tasks are claimed with a single UPDATE ... RETURNING, so several worker
+    processes can consume the same file. A task still running
+    ``visibility_timeout`` seconds after it was claimed is assumed to have
+    died with its process and is handed out again.
+    """
+
+    def __init__(self, path, poll_interval=1.0, visibility_timeout=300):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS task (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                args TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                run_at REAL NOT NULL,
+                enqueued_at REAL NOT NULL,
+                claimed_at REAL,
+                last_error TEXT
+            )""")
+            if 'claimed_at' not in {row[1] for row in conn.execute('PRAGMA table_info(task)')}:
+                conn.execute('ALTER TABLE task ADD COLUMN claimed_at REAL')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_task_status_run_at ON task (status, run_at)')
+
+    def after_fork(self):
+        # SQLite connections must not be shared with the parent process
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def push(self, name, args, run_at, attempts=0, enqueued_at=None, unique=False):
+        args = json.dumps(args)
+        # One statement, so two processes can't both see no pending copy
+        cursor = self._connect().execute(
+            """INSERT INTO task (name, args, attempts, run_at, enqueued_at)
+            SELECT ?, ?, ?, ?, ?
+            WHERE NOT ? OR NOT EXISTS (SELECT 1 FROM task
+                                       WHERE name = ? AND args = ? AND status IN ('queued', 'running'))""",
+            (name, args, attempts, run_at, enqueued_at or time.time(), unique, name, args)
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def pop(self, timeout):
+        deadline = time.time() + timeout
+        while True:
+            now = time.time()
+            # Reclaiming a task counts as an attempt, so one that keeps
+            # killing its worker eventually fails
+            row = self._connect().execute(
+                """UPDATE task SET attempts = attempts + (status = 'running'),
+                                status = 'running', claimed_at = ?
+                WHERE id = (SELECT id FROM task
+                            WHERE (status = 'queued' AND run_at <= ?)
+                               OR (status = 'running' AND COALESCE(claimed_at, 0) < ?)
+                            ORDER BY run_at LIMIT 1)
+                RETURNING id, name, args, attempts, enqueued_at""",
+                (now, now, now - self.visibility_timeout)
+            ).fetchone()
+            if row:
+                task_id, name, args, attempts, enqueued_at = row
+                return {'id': task_id, 'name': name, 'args': json.loads(args),
+                        'attempts': attempts, 'enqueued_at': enqueued_at}
+            if time.time() >= deadline:
+                return None
+            time.sleep(min(self.poll_interval, max(deadline - time.time(), 0)))
+
+    def complete(self, task):
+        self._connect().execute('DELETE FROM task WHERE id = ?', (task['id'],))
+
+    def retry(self, task, run_at, error):
+        self._connect().execute(
+            "UPDATE task SET status = 'queued', attempts = attempts + 1, run_at = ?, last_error = ? WHERE id = ?",
+            (run_at, error, task['id'])
+        )
+
+    def fail(self, task, error):
+        self._connect().execute(
+            "UPDATE task SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+            (error, task['id'])
+        )
+
+    def depth(self):
+        return self._connect().execute("SELECT COUNT(*) FROM task WHERE status = 'queued'").fetchone()[0]
+
+
+class TaskQueue:
+    """Runs registered functions on background worker threads.
+
+    Failed tasks are retried up to ``max_retries`` times, waiting
+    ``backoff * 2 ** attempt`` seconds between attempts. ``context`` is a
+    factory for a context manager entered around every task (for instance
+    ``app.app_context``).
+    """
+
+    def __init__(self, backend, max_retries=3, backoff=2.0, context=None):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.context = context or nullcontext
+        self.tasks = {}
+        self._threads = []
+        self._threads_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0, 'completed': 0, 'retried': 0, 'failed': 0,
+            'wait_seconds_total': 0.0, 'run_seconds_total': 0.0, 'run_seconds_max': 0.0,
+        }
+
+    def task(self, f):
+        self.tasks[f.__name__] = f
+        return f
+
+    def enqueue(self, name, *args, delay=0, unique=False):
+        """Queues a call to the task ``name``. With ``unique``, nothing is
+        queued (and None returned) while the same call is still queued or
+        running."""
+        if name not in self.tasks:
+            raise KeyError(f'Unknown task {name}')
+        task_id = self.backend.push(name, list(args), time.time() + delay, unique=unique)
+        if task_id is not None:
+            self._count('enqueued')
+        return task_id
+
+    def run_one(self, timeout=1.0):
+        task = self.backend.pop(timeout)
+        if task is None:
+            return False
+
+        if task['attempts'] > self.max_retries:
+            # Reclaimed from workers that died running it too many times
+            logger.error('Task %s abandoned after %s attempts', task['name'], task['attempts'])
+            self.backend.fail(task, 'Worker died while running the task')
+            self._count('failed')
+            return True
+
+        started = time.time()
+        try:
+            with self.context():
+                self.tasks[task['name']](*task['args'])
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+            if task['attempts'] < self.max_retries:
+                logger.warning('Task %s failed, retrying: %s', task['name'], error)
+                self.backend.retry(task, time.time() + self.backoff * 2 ** task['attempts'], error)
+                self._count('retried')
+            else:
+                logger.exception('Task %s failed after %s attempts', task['name'], task['attempts'] + 1)
+                self.backend.fail(task, error)
+                self._count('failed')
+            return True
+
+        finished = time.time()
+        self.backend.complete(task)
+        with self._stats_lock:
+            self._stats['completed'] += 1
+            self._stats['wait_seconds_total'] += started - task['enqueued_at']
+            self._stats['run_seconds_total'] += finished - started
+            self._stats['run_seconds_max'] = max(self._stats['run_seconds_max'], finished - started)
+        return True
+
+    def work(self):
+        while not self._stopping.is_set():
+            try:
+                self.run_one()
+            except Exception:
+                logger.exception('Task worker error')
+                time.sleep(1)
+
+    def start(self, workers):
+        # Tops the pool up to ``workers`` threads
+        if len(self._threads) >= workers:
+            return
+        with self._threads_lock:
+            for i in range(len(self._threads), workers):
+                thread = threading.Thread(target=self.work, name=f'task-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def after_fork(self, workers):
+        # Threads don't survive fork(); start a fresh pool in the child
+        self._threads = []
+        self._threads_lock = threading.Lock()
+        self._stopping = threading.Event()
+        if hasattr(self.backend, 'after_fork'):
+            self.backend.after_fork()
+        self.start(workers)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def metrics(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['depth'] = self.backend.depth()
+        return stats
+
+
+def create_queue(queue_type, path=None, visibility_timeout=300, **kwargs):
+    if queue_type == 'sqlite':
+        return TaskQueue(SQLiteBackend(path, visibility_timeout=visibility_timeout), **kwargs)
+    return TaskQueue(MemoryBackend(), **kwargs)
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# The app configures itself on import, so point it at a scratch database and
+# upload folder first
+_tmp = tempfile.mkdtemp(prefix='jobboard-tests-')
+os.environ['DATABASE_URI'] = f'sqlite:///{os.path.join(_tmp, "test.db")}'
+os.environ['UPLOAD_FOLDER'] = os.path.join(_tmp, 'uploads')
+os.environ['TASK_QUEUE_PATH'] = os.path.join(_tmp, 'tasks.db')
+os.environ['CACHE_TYPE'] = 'null'
+os.environ['TASK_WORKERS'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app():
+    import app as app_module
+    from app import app, db
+    from metrics import RequestMetrics
+    from recommend import JobIndex
+
+    with app.app_context():
+        # Every test starts from an empty, fully migrated database and cold
+        # in-process caches
+        db.drop_all()
+        with db.engine.begin() as conn:
+            conn.execute(db.text('DROP TABLE IF EXISTS job_fts'))
+        db.create_all()
+        app_module.run_migrations()
+        app_module.init_search_index()
+        app_module.user_cache.clear()
+        app_module.skill_cache.clear()
+        app_module.job_index = JobIndex(half_life_days=app.config['RECOMMEND_HALF_LIFE_DAYS'])
+        app_module.request_metrics = RequestMetrics()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def auth_headers(app):
+    import jwt
+
+    def auth_headers(user_id):
+        token = jwt.encode({'user_id': user_id, 'exp': datetime.utcnow() + timedelta(hours=1)}, app.config['SECRET_KEY'])
+        return {'Authorization': f'Bearer {token}'}
+    return auth_headers
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+
+def post_job(db, Job, Skill, employer_id):
+    job = Job(title='Archivist', company_name='Acme', location='Remote', job_type='Full-time',
+              category='Other', experience_level='Mid', description='Keeps the records.',
+              user_id=employer_id, skills=[db.session.scalar(db.select(Skill).where(Skill.name == 'sql'))])
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def test_archiving_a_reused_job_id_twice(app):
+    from app import db, User, Job, Skill, JobApplication, job_archive, job_skills_archive, \
+        job_application_archive, archive_expired_jobs
+
+    employer = User(email='archive-employer@example.com', password='x', is_employer=True, company_name='Acme')
+    seeker = User(email='archive-seeker@example.com', password='x')
+    db.session.add_all([employer, seeker, Skill(name='sql')])
+    db.session.commit()
+    employer_id, seeker_id = employer.id, seeker.id
+
+    archived_ids = []
+    for _ in range(2):
+        job = post_job(db, Job, Skill, employer_id)
+        db.session.add(JobApplication(job_id=job.id, user_id=seeker_id))
+        job.expires_at = datetime.utcnow() - timedelta(days=app.config['ARCHIVE_GRACE_DAYS'] + 1)
+        db.session.commit()
+        archived_ids.append(job.id)
+
+        assert archive_expired_jobs() == {'jobs': 1, 'applications': 1}
+        db.session.remove()
+
+    # SQLite hands the archived job's id to the next job
+    assert archived_ids[0] == archived_ids[1]
+    for table, key in ((job_archive, 'id'), (job_skills_archive, 'job_id'), (job_application_archive, 'job_id')):
+        assert db.session.scalar(
+            db.select(db.func.count()).select_from(table).where(table.c[key] == archived_ids[0])
+        ) == 2
+    assert db.session.scalar(db.select(db.func.count(Job.id)).where(Job.user_id == employer_id)) == 0
@@ -0,0 +1,40 @@
+def post_jobs(db, Job, User, add_or_get_skills):
+    employer = User(email='facet-employer@example.com', password='x', is_employer=True, company_name='Acme')
+    db.session.add(employer)
+    db.session.commit()
+    for job_type, experience, skills in (('Full-time', 'Mid', ['python']), ('Full-time', 'Senior', ['python']),
+                                         ('Part-time', 'Mid', ['sql']), ('Contract', 'Entry', [])):
+        db.session.add(Job(title='Engineer', company_name='Acme', location='Remote', job_type=job_type,
+                           category='Other', experience_level=experience, description='Builds things.',
+                           user_id=employer.id, skills=add_or_get_skills(skills)))
+    db.session.commit()
+
+
+def counts(facet):
+    return {entry['value']: entry['count'] for entry in facet}
+
+
+def test_multi_select_facets_leave_out_their_own_filter(app):
+    from app import db, Job, User, add_or_get_skills
+    post_jobs(db, Job, User, add_or_get_skills)
+
+    facets = app.test_client().get(
+        '/api/jobs?facets=true&job_type=Full-time&experience=Mid&facet_skills=sql&facet_skills=rust'
+    ).get_json()['facets']
+
+    # Each option of job_type counts jobs matching the experience filter, and
+    # the other way round
+    assert counts(facets['job_type']) == {'Full-time': 1, 'Part-time': 1}
+    assert counts(facets['experience_level']) == {'Mid': 1, 'Senior': 1}
+    # Skills are counted over every filter; named skills are always listed
+    assert counts(facets['skills']) == {'python': 1, 'sql': 0, 'rust': 0}
+
+
+def test_skills_facet_in_any_mode_leaves_out_the_skills_filter(app):
+    from app import db, Job, User, add_or_get_skills
+    post_jobs(db, Job, User, add_or_get_skills)
+
+    facets = app.test_client().get('/api/jobs?facets=true&skills=python&skills_match=any').get_json()['facets']
+
+    assert counts(facets['skills']) == {'python': 2, 'sql': 1}
+    assert counts(facets['job_type']) == {'Full-time': 2}
@@ -0,0 +1,52 @@
+import json
+
+
+def create_employer(db, User):
+    employer = User(email='import-employer@example.com', password='x', is_employer=True, company_name='Acme')
+    db.session.add(employer)
+    db.session.commit()
+    return employer.id
+
+
+def feed(*rows):
+    return '\n'.join(json.dumps(row) for row in rows)
+
+
+def job_row(n, **fields):
+    return {'job_title': f'Engineer {n}', 'location': 'Remote', 'job_type': 'Full-time', 'category': 'Other',
+            'experience': 'Mid', 'description': 'Builds things.', **fields}
+
+
+def test_chunk_size_is_capped(app, auth_headers, monkeypatch):
+    import app as app_module
+    from app import db, User
+
+    employer_id = create_employer(db, User)
+    monkeypatch.setitem(app.config, 'IMPORT_CHUNK_SIZE', 2)
+    chunks = []
+    import_job_chunk = app_module.import_job_chunk
+    monkeypatch.setattr(app_module, 'import_job_chunk',
+                        lambda chunk, *args: (chunks.append(len(chunk)), import_job_chunk(chunk, *args)))
+
+    response = app.test_client().post('/api/jobs/import?chunk_size=1000000', headers=auth_headers(employer_id),
+                                      data=feed(*(job_row(n) for n in range(5))))
+
+    assert response.status_code == 200
+    assert response.get_json()['created'] == 5
+    assert chunks == [2, 2, 1]
+
+
+def test_rows_with_non_string_fields_fail_alone(app, auth_headers):
+    from app import db, User
+
+    employer_id = create_employer(db, User)
+    response = app.test_client().post('/api/jobs/import', headers=auth_headers(employer_id), data=feed(
+        job_row(1, skills={'a': 1}), job_row(2, external_id=5), job_row(3, skills=['python', 'sql'])
+    ))
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report['created'] == 1 and report['failed'] == 2
+    assert [error['row'] for error in report['errors']] == [1, 2]
+    assert 'skills must be a string or a list of strings' in report['errors'][0]['error']
+    assert 'external_id' in report['errors'][1]['error']
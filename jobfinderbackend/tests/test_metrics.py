@@ -0,0 +1,13 @@
+import os
+
+
+def test_metrics_are_labelled_by_process_and_typed(app):
+    client = app.test_client()
+    client.get('/api/jobs')
+    body = client.get('/metrics').get_data(as_text=True)
+
+    assert f'http_requests_total{{pid="{os.getpid()}",endpoint="get_jobs",method="GET",status="200"}} 1.0' in body
+    assert '# TYPE task_queue_completed_total counter' in body
+    assert '# TYPE task_queue_wait_seconds_total counter' in body
+    assert '# TYPE task_queue_depth gauge' in body
+    assert f'task_queue_depth{{pid="{os.getpid()}"}} 0' in body
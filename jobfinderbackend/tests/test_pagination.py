@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.fixture
+def listings(app):
+    from app import db, User, Job, JobApplication
+
+    employer = User(email='pages-employer@example.com', password='x', is_employer=True, company_name='Acme')
+    seeker = User(email='pages-seeker@example.com', password='x')
+    db.session.add_all([employer, seeker])
+    db.session.commit()
+    jobs = [Job(title=f'Engineer {n}', company_name='Acme', location='Remote', job_type='Full-time',
+                category='Other', experience_level='Mid', description='Builds things.', user_id=employer.id)
+            for n in range(101)]
+    db.session.add_all(jobs)
+    db.session.commit()
+    db.session.add_all([JobApplication(job_id=job.id, user_id=seeker.id) for job in jobs])
+    db.session.commit()
+    return employer.id
+
+
+@pytest.mark.parametrize('per_page, size', [(0, 1), (-5, 1), (1000, 100)])
+def test_cursor_pages_are_clamped(app, auth_headers, listings, per_page, size):
+    client = app.test_client()
+
+    jobs = client.get(f'/api/jobs?cursor=&per_page={per_page}')
+    applications = client.get(f'/api/applications?cursor=&per_page={per_page}', headers=auth_headers(listings))
+
+    assert jobs.status_code == 200 and len(jobs.get_json()['jobs']) == size
+    assert applications.status_code == 200 and len(applications.get_json()['applications']) == size
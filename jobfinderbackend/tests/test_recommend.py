@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+
+def test_refresh_picks_up_a_change_committed_late(app):
+    from app import db, User, Job, job_index, refresh_job_index
+
+    employer = User(email='recommend-employer@example.com', password='x', is_employer=True, company_name='Acme')
+    db.session.add(employer)
+    db.session.commit()
+    jobs = [Job(title=f'Engineer {n}', company_name='Acme', location='Remote', job_type='Full-time',
+                category='Other', experience_level='Mid', description='Builds things.', user_id=employer.id)
+            for n in range(2)]
+    db.session.add_all(jobs)
+    db.session.commit()
+    job_index.mark_stale()
+    refresh_job_index()
+
+    # A transaction that stamped its change before the newest one seen so far
+    # but committed after the last refresh
+    early, late = jobs
+    late.title = 'Senior Engineer'
+    db.session.commit()
+    job_index.mark_stale()
+    refresh_job_index()
+    early.category = 'DevOps'
+    db.session.commit()
+    db.session.execute(db.update(Job).where(Job.id == early.id).values(updated_at=job_index.watermark - timedelta(seconds=1)))
+    db.session.commit()
+
+    upserted = []
+    upsert = job_index.upsert
+    job_index.upsert = lambda jobs, links: (upserted.extend(job[0] for job in jobs), upsert(jobs, links))
+    try:
+        job_index.mark_stale()
+        refresh_job_index()
+    finally:
+        del job_index.upsert
+    assert early.id in upserted
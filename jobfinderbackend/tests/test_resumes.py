@@ -0,0 +1,31 @@
+import io
+import zipfile
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+
+def test_storing_the_same_resume_concurrently(app, monkeypatch):
+    from app import db, store_resume
+
+    path = store_resume(FileStorage(io.BytesIO(b'%PDF-1.4 same resume'), filename='first.pdf')).path
+    db.session.commit()
+    db.session.expunge_all()
+
+    # The second upload looked for the row before the first one committed
+    get, missed = db.session.get, []
+    monkeypatch.setattr(db.session, 'get', lambda *args: get(*args) if missed else missed.append(args))
+    second = store_resume(FileStorage(io.BytesIO(b'%PDF-1.4 same resume'), filename='second.pdf'))
+    db.session.commit()
+    assert missed and second.path == path
+
+
+def test_docx_text_over_the_cap_is_not_inflated(app, tmp_path, monkeypatch):
+    from app import extract_resume_text
+
+    path = tmp_path / 'bomb.docx'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('word/document.xml', b'<w:t>a</w:t>' * 100000)
+    monkeypatch.setitem(app.config, 'RESUME_MAX_TEXT_BYTES', 1024)
+    with pytest.raises(ValueError):
+        extract_resume_text(path, 'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
@@ -0,0 +1,19 @@
+def test_search_index_set_up_by_migrate_after_import_without_migrations(app):
+    import app as app_module
+    from app import db
+
+    # AUTO_MIGRATE=false on an empty database: the app is imported before
+    # `flask migrate` creates the tables
+    db.drop_all()
+    with db.engine.begin() as conn:
+        conn.execute(db.text('DROP TABLE IF EXISTS job_fts'))
+    app_module.init_search_index()
+    assert not db.inspect(db.engine).has_table('job_fts')
+
+    db.create_all()
+    app_module.run_migrations()
+    app_module.init_search_index()
+    with db.engine.connect() as conn:
+        rank = conn.scalar(db.text("SELECT v FROM job_fts_config WHERE k = 'rank'"))
+    assert rank == 'bm25(10.0, 5.0, 1.0)'
+    assert app_module.SEARCH_BACKEND == 'fts5'
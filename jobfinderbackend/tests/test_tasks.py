@@ -0,0 +1,22 @@
+import pytest
+
+from tasks import MemoryBackend, SQLiteBackend, TaskQueue
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def queue(request, tmp_path):
+    backend = MemoryBackend() if request.param == 'memory' else SQLiteBackend(str(tmp_path / 'tasks.db'))
+    queue = TaskQueue(backend)
+    queue.tasks['archive'] = lambda: None
+    return queue
+
+
+def test_unique_tasks_are_queued_once_until_they_finish(queue):
+    assert queue.enqueue('archive', unique=True) is not None
+    assert queue.enqueue('archive', unique=True) is None
+    assert queue.backend.depth() == 1
+
+    assert queue.run_one(timeout=0)
+    assert queue.enqueue('archive', unique=True) is not None
+    assert queue.enqueue('archive') is not None
+    assert queue.metrics()['enqueued'] == 3
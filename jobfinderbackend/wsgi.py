@@ -0,0 +1,15 @@
+# Production entry point.
+#
+#   flask --app app migrate
+#   AUTO_MIGRATE=false gunicorn -c gunicorn.conf.py wsgi:application
+#   AUTO_MIGRATE=false uvicorn wsgi:asgi_application --workers 4   (needs asgiref)
+from app import app
+
+application = app
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # ASGI servers are optional
+    asgi_application = None
+else:
+    asgi_application = WsgiToAsgi(app)